@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from browser_profiles import execute_cdp
+
+logger = logging.getLogger("TestAutomation")
+
+
+class PooledBrowser:
+
+    def __init__(self, driver, startup_time):
+        self.driver = driver
+        self.startup_time = startup_time
+        self.reset_time = 0.0
+        self.uses = 0
+
+
+class BrowserPool:
+
+    def __init__(self, factory, max_uses=None, max_size=None, dispose=None, origins=(), acquire_timeout=None):
+        self.factory = factory
+        self.dispose = dispose
+        self.origins = list(origins)
+        self.max_uses = max_uses or int(os.environ.get("BROWSER_POOL_MAX_USES", "25"))
+        self.max_size = max_size or int(os.environ.get("BROWSER_POOL_SIZE", "1"))
+        self.acquire_timeout = acquire_timeout or float(os.environ.get("BROWSER_POOL_ACQUIRE_TIMEOUT", "300"))
+        self._idle = []
+        self._live = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._idle or self._live < self.max_size,
+                                            timeout=self.acquire_timeout):
+                raise RuntimeError(f"No pooled browser became free within {self.acquire_timeout:.0f}s "
+                                   f"({self._live}/{self.max_size} browsers in use)")
+            browser = self._idle.pop() if self._idle else None
+            if browser is None:
+                self._live += 1
+
+        if browser is not None:
+            try:
+                browser.reset_time = self.reset(browser.driver, self.origins)
+                browser.startup_time = 0.0
+            except Exception as e:
+                logger.warning(f"Browser reset failed, replacing instance: {e}")
+                self._quit(browser)
+                browser = None
+
+        if browser is None:
+            try:
+                browser = self._launch()
+            except Exception:
+                with self._condition:
+                    self._live -= 1
+                    self._condition.notify()
+                raise
+
+        browser.uses += 1
+        return browser
+
+    def release(self, browser, recycle=False, lost=False):
+        if lost:
+            logger.info("Dropping browser whose Selenium node stopped responding")
+            self._dispose(browser)
+            with self._condition:
+                self._live -= 1
+                self._condition.notify()
+            return
+
+        if recycle or browser.uses >= self.max_uses:
+            reason = "test failure" if recycle else f"{browser.uses} uses"
+            logger.info(f"Recycling browser after {reason}")
+            self._quit(browser)
+            with self._condition:
+                self._live -= 1
+                self._condition.notify()
+            return
+
+        with self._condition:
+            self._idle.append(browser)
+            self._condition.notify()
+
+    def evict_idle(self):
+        with self._condition:
+            if not self._idle:
+                return False
+            browser = self._idle.pop(0)
+            self._live -= 1
+            self._condition.notify()
+        logger.info("Closing idle browser to free a Selenium node session")
+        self._quit(browser)
+        return True
+
+    def close(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+        for browser in idle:
+            self._quit(browser)
+
+    @staticmethod
+    def reset(driver, origins=()):
+        start = time.perf_counter()
+
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+        )
+        # local/session storage, IndexedDB, Cache Storage and service workers of the site under test,
+        # wherever the test ended; other origins only lose what the current page can clear above
+        for origin in set(map(origin_of, [*origins, driver.current_url])) - {None}:
+            try:
+                execute_cdp(driver, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            except Exception as e:
+                logger.debug(f"Could not clear storage for {origin}: {e}")
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+        return time.perf_counter() - start
+
+    def _launch(self):
+        start = time.perf_counter()
+        driver = self.factory()
+        return PooledBrowser(driver, time.perf_counter() - start)
+
+    def _quit(self, browser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting browser: {e}")
+        self._dispose(browser)
+
+    def _dispose(self, browser):
+        if self.dispose is not None:
+            self.dispose(browser.driver)
+
+
+def origin_of(url):
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
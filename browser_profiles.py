@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger("TestAutomation")
+
+BLOCKED_MEDIA = ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+                 "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm"]
+BLOCKED_THIRD_PARTY = ["*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*",
+                       "*googlesyndication.com*", "*amazon-adsystem.com*", "*fls-na.amazon.com*",
+                       "*unagi.amazon.com*", "*facebook.net*"]
+
+
+def execute_cdp(driver, cmd, params):
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(cmd, params)
+    # webdriver.Remote sessions opened through a ChromiumRemoteConnection
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})['value']
+
+
+class BrowserProfile:
+
+    def __init__(self, name, page_load_strategy="normal", headless=False, blocked_urls=(), arguments=()):
+        self.name = name
+        self.page_load_strategy = page_load_strategy
+        self.headless = headless
+        self.blocked_urls = list(blocked_urls)
+        self.arguments = list(arguments)
+
+    def chrome_options(self):
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument("--start-maximized")
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_argument("--disable-popup-blocking")
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
+        for argument in self.arguments:
+            chrome_options.add_argument(argument)
+        chrome_options.page_load_strategy = self.page_load_strategy
+        if self.blocked_urls:
+            # the performance log only feeds the blocked-request summary, so other profiles leave it off
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        return chrome_options
+
+    def network_log(self, driver):
+        if not self.blocked_urls:
+            return []
+        try:
+            return driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Could not read performance log: {e}")
+            return []
+
+    def apply(self, driver):
+        if self.blocked_urls:
+            execute_cdp(driver, "Network.enable", {})
+            execute_cdp(driver, "Network.setBlockedURLs", {"urls": self.blocked_urls})
+
+    def describe(self):
+        mode = "headless" if self.headless else "headed"
+        return (f"{self.name} (page load: {self.page_load_strategy}, {mode}, "
+                f"{len(self.blocked_urls)} blocked URL patterns)")
+
+    def network_summary(self, entries):
+        if not self.blocked_urls:
+            return None
+        blocked = 0
+        transferred = 0
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            if message['method'] == "Network.loadingFailed" and message['params'].get('blockedReason'):
+                blocked += 1
+            elif message['method'] == "Network.loadingFinished":
+                transferred += message['params'].get('encodedDataLength', 0)
+        return {'blocked_requests': blocked, 'transferred_bytes': transferred}
+
+
+PROFILES = {
+    "full-fidelity": BrowserProfile("full-fidelity"),
+    "functional-fast": BrowserProfile(
+        "functional-fast",
+        page_load_strategy="eager",
+        headless=True,
+        blocked_urls=BLOCKED_MEDIA + BLOCKED_THIRD_PARTY
+    ),
+}
+
+
+def marker_profiles():
+    mapping = {}
+    for pair in os.environ.get("BROWSER_PROFILE_BY_MARKER", "").split(","):
+        if "=" in pair:
+            marker, profile = pair.split("=", 1)
+            mapping[marker.strip()] = profile.strip()
+    return mapping
+
+
+def profile_for(item):
+    marker = item.get_closest_marker("browser_profile")
+    if marker and marker.args:
+        name = marker.args[0]
+    else:
+        by_marker = marker_profiles()
+        name = next((by_marker[m.name] for m in item.iter_markers() if m.name in by_marker),
+                    os.environ.get("BROWSER_PROFILE", "full-fidelity"))
+    if name not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{name}', expected one of: {', '.join(PROFILES)}")
+    return PROFILES[name]
@@ -1,17 +1,80 @@
+import time
+import_started = time.perf_counter()
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import logging
 from log_config import LogConfig
 from extent_report import ExtentReport
+from browser_pool import BrowserPool
+from driver_resolver import DriverResolver
+from duration_history import DurationHistory
+from screenshot_pipeline import ScreenshotPipeline
+from smart_wait import SmartWait
+from driver_profiler import DriverProfiler
+from site_replay import SiteReplayServer
+from browser_profiles import profile_for
+from perf_metrics import BUDGET_METRICS, PerfMetricsCollector
+from results_store import ResultsStore, changed_test_files
+from threaded_runner import ThreadedRunner
+from rerun_policy import RerunPolicy
+from failure_artifacts import BrowserLogBuffer, artifact_dir, capture_enabled
+from node_registry import NodeRegistry, configured_nodes
+from _pytest.runner import runtestprotocol
+from contextlib import contextmanager
+import threading
 import os
-from datetime import datetime
 
-logger = LogConfig.setup_logger()
+logger = logging.getLogger("TestAutomation")
 
-extent_report = ExtentReport("Selenium_Test_Execution_Report")
+class Framework:
+
+    def __init__(self):
+        self.started = False
+        self.node_registry = None
+        self.startup = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.started:
+                return self
+            start = time.perf_counter()
+            LogConfig.setup_logger()
+            self.extent_report = ExtentReport("Selenium_Test_Execution_Report",
+                                              stream_dir=os.environ.get("TEST_WORKER_DIR"))
+            self.driver_resolver = DriverResolver()
+            self.screenshot_pipeline = ScreenshotPipeline(self.extent_report.screenshot_dir)
+            self.perf_collector = PerfMetricsCollector()
+            self.run_id = os.environ.get("TEST_RUN_ID") or self.extent_report.start_time.strftime('%Y%m%d_%H%M%S')
+            self.node_registry = NodeRegistry.from_env()
+            if self.node_registry is not None:
+                self.node_registry.start()
+            self.startup['Framework initialization'] = time.perf_counter() - start
+            self.started = True
+
+        logger.info("Startup: " + ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.startup.items()))
+        return self
+
+framework = Framework()
+
+framework.startup['Conftest import'] = time.perf_counter() - import_started
+
+results_store = ResultsStore()
+
+rerun_policy = RerunPolicy()
+
+test_results = {}
+
+browser_tests = set()
+
+browser_pools = {}
+
+site_server = None
+
+session_lock = threading.Lock()
 
 @pytest.fixture(scope="class")
 def setup_class(request):
+    framework.start()
     logger.info("=" * 80)
     logger.info("SETUP CLASS: Initializing test class")
     logger.info(f"Test Class: {request.cls.__name__}")
@@ -23,68 +86,458 @@ def setup_class(request):
     logger.info("TEARDOWN CLASS: Cleaning up test class")
     logger.info("=" * 80)
 
-@pytest.fixture(scope="function")
-def setup_method(request):
+def create_driver(profile):
+    from selenium import webdriver
     from selenium.webdriver.chrome.service import Service
-    from webdriver_manager.chrome import ChromeDriverManager
-    
+
+    if framework.node_registry is not None:
+        return create_remote_driver(profile, framework.node_registry)
+
+    logger.info(f"Initializing Chrome WebDriver with profile {profile.name}...")
+    service = Service(framework.driver_resolver.resolve()['driver_path'])
+    driver = webdriver.Chrome(service=service, options=chrome_options(profile))
+    profile.apply(driver)
+
+    logger.info("WebDriver initialized successfully")
+    return driver
+
+def create_remote_driver(profile, registry):
+    from selenium import webdriver
+    from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+    for _ in registry.nodes:
+        node = registry.acquire(reclaim=reclaim_idle_browser)
+        logger.info(f"Starting remote WebDriver with profile {profile.name} on {node.describe()}...")
+        try:
+            connection = ChromiumRemoteConnection(node.url, vendor_prefix="goog", browser_name="chrome")
+            driver = webdriver.Remote(command_executor=connection, options=chrome_options(profile))
+        except Exception as e:
+            registry.release_node(node)
+            if registry.check(node):
+                raise
+            logger.warning(f"Selenium node {node.url} failed to start a session, trying another node: {e}")
+            continue
+        registry.register(driver, node)
+        profile.apply(driver)
+        logger.info(f"Remote WebDriver session {driver.session_id} started on {node.url}")
+        return driver
+    raise RuntimeError("Could not start a browser on any Selenium node: " +
+                       ", ".join(node.describe() for node in registry.nodes))
+
+def chrome_options(profile):
+    options = profile.chrome_options()
+    if site_server is not None:
+        for argument in site_server.chrome_arguments():
+            options.add_argument(argument)
+    return options
+
+def reclaim_idle_browser():
+    return any(pool.evict_idle() for pool in list(browser_pools.values()))
+
+def release_session(driver):
+    if framework.node_registry is not None:
+        framework.node_registry.release(driver)
+
+class TestContext:
+
+    __slots__ = ("driver", "wait", "base_url", "test_info", "extent_report")
+
+    def __init__(self, driver, wait, base_url, test_info, extent_report):
+        self.driver = driver
+        self.wait = wait
+        self.base_url = base_url
+        self.test_info = test_info
+        self.extent_report = extent_report
+
+    def bind(self, instance):
+        for name in self.__slots__:
+            setattr(instance, name, getattr(self, name))
+
+def thread_count():
+    return int(os.environ.get("TEST_THREADS") or sum(node.max_sessions for node in configured_nodes()) or 1)
+
+def pool_for(profile, site_url):
+    with session_lock:
+        if profile.name not in browser_pools:
+            threads = thread_count()
+            browser_pools[profile.name] = BrowserPool(lambda: create_driver(profile), dispose=release_session,
+                                                      max_size=threads if threads > 1 else None,
+                                                      origins=[site_url])
+        return browser_pools[profile.name]
+
+def site_under_test():
+    global site_server
+    import pages
+    base_url = os.environ.get("BASE_URL", pages.AMAZON_URL)
+    mode = os.environ.get("SITE_MODE", "live")
+    if mode == "live":
+        return base_url
+
+    with session_lock:
+        if site_server is None:
+            site_server = SiteReplayServer(
+                base_url,
+                mode=mode,
+                snapshot_dir=os.environ.get("SITE_SNAPSHOT_DIR", "snapshots"),
+                latency_ms=int(os.environ.get("REPLAY_LATENCY_MS", "0")),
+                volatile_params=[name.strip() for name in os.environ["SITE_VOLATILE_PARAMS"].split(",")]
+                if "SITE_VOLATILE_PARAMS" in os.environ else None
+            ).start()
+        return site_server.url
+
+@pytest.fixture(scope="session")
+def site_url():
+    return site_under_test()
+
+@contextmanager
+def browser_test(node):
+    framework.start()
+    browser_tests.add(node.nodeid)
+    extent_report = framework.extent_report
+    perf_collector = framework.perf_collector
+    site_url = site_under_test()
     logger.info("-" * 80)
-    logger.info(f"SETUP METHOD: {request.node.name}")
+    logger.info(f"SETUP METHOD: {node.name}")
     logger.info("-" * 80)
     
-    logger.info("Initializing Chrome WebDriver...")
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--disable-popup-blocking")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.implicitly_wait(10)
-    
-    logger.info("WebDriver initialized successfully")
-    
-    test_name = request.node.name
-    test_description = request.node.function.__doc__ or "No description"
-    test_info = extent_report.start_test(test_name, test_description)
-    extent_report.log(test_info, "INFO", "Test started")
-    extent_report.log(test_info, "INFO", f"Browser: Chrome")
+    profile = profile_for(node)
+    browser_pool = pool_for(profile, site_url)
+    browser = browser_pool.acquire()
+    # any error before the release below recycles the browser instead of leaking its pool slot
+    recycle, lost = True, False
+    try:
+        driver = browser.driver
+        # drop the previous test's entries so the summary below only counts this one
+        profile.network_log(driver)
+        browser_logs = None
+        if capture_enabled():
+            try:
+                browser_logs = BrowserLogBuffer().start(driver)
+            except Exception as e:
+                logger.warning(f"Could not start browser log capture: {e}")
+        if browser.startup_time:
+            browser_timing = f"Browser startup: {browser.startup_time * 1000:.0f}ms"
+        else:
+            browser_timing = f"Browser reused (use {browser.uses}), reset: {browser.reset_time * 1000:.0f}ms"
+        logger.info(browser_timing)
     
-    request.cls.driver = driver
-    request.cls.test_info = test_info
-    request.cls.extent_report = extent_report
+        test_name = node.name
+        attempt = getattr(node, "attempt", 1)
+        test_info = getattr(node, "rerun_record", None)
+        if test_info is None:
+            test_description = node.function.__doc__ or "No description"
+            markers = [m.name for m in node.iter_markers() if m.name not in ("usefixtures", "parametrize")]
+            test_info = extent_report.start_test(test_name, test_description, hold=True, markers=markers)
+            extent_report.log(test_info, "INFO", "Test started")
+            extent_report.log(test_info, "INFO", f"Browser: Chrome")
+            extent_report.log(test_info, "INFO", f"Browser profile: {profile.describe()}")
+            extent_report.log(test_info, "INFO", browser_timing)
+            extent_report.log(test_info, "INFO", f"Site under test: {site_url} ({os.environ.get('SITE_MODE', 'live')})")
+        else:
+            extent_report.log(test_info, "INFO", f"Attempt {attempt}/{rerun_policy.attempts} started. {browser_timing}")
+        attempt_started = time.perf_counter()
     
-    yield
+        collect_perf = node.get_closest_marker("perf_budget") is not None or os.environ.get("PERF_METRICS") == "1"
+        node.perf_pages = []
+
+        def collect_page_metrics():
+            try:
+                url, metrics = perf_collector.collect(driver)
+            except Exception as e:
+                logger.warning(f"Could not collect performance metrics: {e}")
+                extent_report.log(test_info, "WARNING", f"Could not collect performance metrics: {e}")
+                return
+            baseline = perf_collector.baseline(test_name, url)
+            perf_collector.record(framework.run_id, test_name, url, metrics)
+            node.perf_pages.append((url, metrics))
+            extent_report.add_metrics(test_info, url, metrics, baseline)
+
+        def on_command(command, start, duration):
+            extent_report.add_timing(test_info, "command", command, start, duration)
+            if collect_perf and command == "get":
+                collect_page_metrics()
+
+        profiler = DriverProfiler.attach(driver)
+        profiler.on_command = on_command
+
+        def record_wait(record):
+            extent_report.add_timing(test_info, "wait", record.name, time.perf_counter() - record.elapsed, record.elapsed)
+            outcome = "" if record.success else " (timed out)"
+            extent_report.log(test_info, "INFO" if record.success else "WARNING",
+                              f"Wait '{record.name}': {record.elapsed * 1000:.0f}ms, {record.polls} polls{outcome}")
+
+        wait = SmartWait(driver, timeout=float(os.environ.get("WAIT_TIMEOUT", "15")), on_wait=record_wait)
     
-    logger.info("-" * 80)
-    logger.info(f"TEARDOWN METHOD: {request.node.name}")
-
-    if request.node.rep_call.failed:
-        import time
-        logger.error("Test FAILED - Capturing screenshot...")
-        time.sleep(1)
-        screenshot_name = f"FAILED_{request.node.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        screenshot_path = os.path.join("screenshots", screenshot_name)
-        driver.save_screenshot(screenshot_path)
-        logger.error(f"Screenshot saved: {screenshot_path}")
-        extent_report.add_screenshot(test_info, screenshot_path)
-        extent_report.log(test_info, "ERROR", f"Screenshot captured: {screenshot_name}")
+        yield TestContext(driver, wait, site_url, test_info, extent_report)
     
-    driver.quit()
-    logger.info("WebDriver closed")
+        logger.info("-" * 80)
+        logger.info(f"TEARDOWN METHOD: {node.name}")
+
+        rep_call = getattr(node, "rep_call", None)
+        failed = rep_call is not None and rep_call.failed
+        registry = framework.node_registry
+        selenium_node = registry.node_for(driver) if registry is not None else None
+        node.node_lost = failed and selenium_node is not None and registry.lost(driver)
+
+        try:
+            network = None
+            if not node.node_lost and profile.blocked_urls:
+                network = profile.network_summary(profile.network_log(driver))
+            if network:
+                extent_report.log(test_info, "INFO",
+                                  f"Blocked {network['blocked_requests']} requests, "
+                                  f"{network['transferred_bytes'] / 1024:.0f} KB transferred")
+        except Exception as e:
+            logger.warning(f"Could not read network summary: {e}")
+
+        if wait.records:
+            extent_report.log(test_info, "INFO",
+                              f"Total wait time: {wait.total_time * 1000:.0f}ms across {len(wait.records)} waits")
+
+        if failed and not node.node_lost:
+            logger.error("Test FAILED - Capturing screenshot...")
+            try:
+                screenshot_path = framework.screenshot_pipeline.capture(driver, node.name)
+                logger.error(f"Screenshot queued: {screenshot_path}")
+                extent_report.add_screenshot(test_info, screenshot_path)
+                extent_report.log(test_info, "ERROR", f"Screenshot captured: {os.path.basename(screenshot_path)}")
+            except Exception as e:
+                logger.error(f"Screenshot capture failed: {e}")
+            if browser_logs is not None:
+                directory = artifact_dir(framework.run_id, node.name, attempt)
+                try:
+                    for label, path in browser_logs.write_artifacts(driver, directory):
+                        extent_report.add_artifact(test_info, label, path)
+                    logger.error(f"Failure artifacts saved: {directory}")
+                except Exception as e:
+                    logger.error(f"Failure artifact capture failed: {e}")
+        if browser_logs is not None and not node.node_lost:
+            try:
+                browser_logs.stop(driver)
+            except Exception as e:
+                logger.debug(f"Could not stop browser log capture: {e}")
+
+        requeue = rerun_policy.will_requeue(node)
+        rerun = not requeue and rerun_policy.will_rerun(node)
+        if rerun_policy.reruns or node.node_lost or test_info.attempts:
+            error = rep_call.longrepr.reprcrash.message if failed and hasattr(rep_call.longrepr, "reprcrash") else None
+            status = "LOST" if node.node_lost else "FAIL" if failed else "SKIP" if rep_call is None or rep_call.skipped else "PASS"
+            extent_report.add_attempt(test_info, attempt, status, attempt_started,
+                                      time.perf_counter() - attempt_started, error)
+
+        profiler.on_command = None
+        if requeue or rerun:
+            if requeue:
+                message = f"Selenium node {selenium_node.url} stopped responding, test re-queued"
+            else:
+                message = (f"Attempt {attempt}/{rerun_policy.attempts} failed, "
+                           f"retrying in {rerun_policy.delay(attempt):.1f}s")
+            logger.warning(message)
+            extent_report.log(test_info, "WARNING", message)
+            test_info.status = 'RUNNING'
+            test_info.perf_end = None
+            test_info.error = None
+            node.rerun_record = test_info
+        else:
+            if attempt > 1 and not failed:
+                extent_report.log(test_info, "PASS", f"Passed on attempt {attempt}/{rerun_policy.attempts}")
+                test_info.markers.append("flaky")
+            if failed and test_info.status != 'FAIL':
+                extent_report.end_test(test_info, "FAIL", str(rep_call.longrepr))
+            elif test_info.status == 'RUNNING':
+                extent_report.end_test(test_info, "SKIP" if rep_call is None or rep_call.skipped else "PASS")
+            extent_report.close_test(test_info)
+            node.rerun_record = None
+        recycle, lost = failed and not rerun, node.node_lost
+    finally:
+        browser_pool.release(browser, recycle=recycle, lost=lost)
+    logger.info("WebDriver released to pool")
     logger.info("-" * 80)
 
+@pytest.fixture(scope="function")
+def setup_method(request):
+    with browser_test(request.node) as context:
+        context.bind(request.instance)
+        yield
+
+def _priority(item):
+    marker = item.get_closest_marker("priority")
+    return marker.args[0] if marker and marker.args else float("inf")
+
+def pytest_collection(session):
+    session.collection_started = time.perf_counter()
+
+def pytest_collection_finish(session):
+    framework.startup['Collection'] = time.perf_counter() - session.collection_started
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        marker = item.get_closest_marker("perf_budget")
+        unknown = PerfMetricsCollector.unknown_budget_metrics(marker.kwargs) if marker else []
+        if unknown:
+            raise pytest.UsageError(f"{item.nodeid}: unknown perf_budget metrics {', '.join(unknown)} "
+                                    f"(known: {', '.join(BUDGET_METRICS)})")
+
+    shard_file = os.environ.get("TEST_SHARD_FILE")
+    if shard_file:
+        with open(shard_file, 'r', encoding='utf-8') as f:
+            shard = {line.strip() for line in f if line.strip()}
+        deselected = [item for item in items if item.nodeid not in shard]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in shard]
+
+    if os.environ.get("TEST_ORDER") == "failed-first":
+        recent_failures = results_store.recent_failures()
+        changed_files = changed_test_files()
+
+        def rank(item):
+            if item.nodeid in recent_failures:
+                return 0
+            return 1 if item.nodeid.split("::")[0] in changed_files else 2
+
+        items.sort(key=lambda item: (rank(item), _priority(item)))
+        logger.info(f"Failed-first ordering: {len(recent_failures)} recent failures, "
+                    f"{len(changed_files)} changed files")
+    else:
+        items.sort(key=_priority)
+
+def pytest_configure(config):
+    if thread_count() > 1 and config.getoption("capture") != "no":
+        raise pytest.UsageError("TEST_THREADS > 1 needs output capturing disabled: run pytest with -s")
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    if session.config.option.collectonly or not session.items:
+        return None
+    if session.testsfailed and not session.config.option.continue_on_collection_errors:
+        return None
+    threads = thread_count()
+    if threads <= 1:
+        return None
+    ThreadedRunner(session, threads, browser_test, rerun_policy).run()
+    return True
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    if not rerun_policy.reruns and not configured_nodes():
+        return None
+    attempt = 1
+    while True:
+        RerunPolicy.start_attempt(item, attempt)
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        reports = runtestprotocol(item, nextitem=nextitem, log=False)
+        requeue = rerun_policy.will_requeue(item)
+        if not requeue and not rerun_policy.will_rerun(item):
+            break
+        for report in RerunPolicy.mark_rerun(reports):
+            item.ihook.pytest_runtest_logreport(report=report)
+        if requeue:
+            RerunPolicy.requeue(item)
+        else:
+            time.sleep(rerun_policy.delay(attempt))
+            attempt += 1
+    for report in reports:
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+def pytest_report_teststatus(report):
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("perf_budget")
+    if marker is None:
+        return
+    violations = PerfMetricsCollector.check_budget(getattr(item, "perf_pages", []), marker.kwargs)
+    if violations:
+        pytest.fail("Performance budget exceeded: " + "; ".join(violations))
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     setattr(item, "rep_" + rep.when, rep)
 
+def pytest_runtest_logreport(report):
+    if report.outcome == "rerun":
+        return
+    result = test_results.setdefault(report.nodeid, {'outcome': 'passed', 'duration': 0.0, 'error': None})
+    result['duration'] += report.duration
+    if report.failed and result['outcome'] != 'failed':
+        result['outcome'] = 'failed'
+        crash = getattr(report.longrepr, "reprcrash", None)
+        result['error'] = crash.message if crash is not None else str(report.longrepr)
+    elif report.skipped and result['outcome'] == 'passed':
+        result['outcome'] = 'skipped'
+
 def pytest_sessionfinish(session, exitstatus):
+    if not framework.started:
+        return
+    extent_report = framework.extent_report
+    run_id = framework.run_id
+
     logger.info("=" * 80)
     logger.info("TEST SUITE COMPLETED")
     logger.info("=" * 80)
 
+    for pool in browser_pools.values():
+        pool.close()
+    if browser_pools:
+        logger.info("Browser pools closed")
+    if framework.node_registry is not None:
+        framework.node_registry.stop()
+        for selenium_node in framework.node_registry.nodes:
+            logger.info(f"Selenium node {selenium_node.url}: {selenium_node.sessions_started} sessions started, "
+                        f"{selenium_node.sessions_lost} lost")
+    if site_server is not None:
+        site_server.stop()
+    framework.screenshot_pipeline.close()
+
+    log_stats = LogConfig.stats()
+    logger.info(f"Logging overhead: {log_stats['records']} records, "
+                f"{log_stats['call_time'] * 1000:.1f}ms in logging calls "
+                f"({log_stats['per_record_us']:.1f}us per record)")
+
+    # browser-free tests would skew flakiness, regressions and shard balancing
+    recorded = {nodeid: result for nodeid, result in test_results.items() if nodeid in browser_tests}
+    test_durations = {nodeid: result['duration'] for nodeid, result in recorded.items()}
+    if recorded:
+        try:
+            results_store.record_run(run_id, recorded)
+        except Exception as e:
+            logger.warning(f"Could not record results in {results_store.path}: {e}")
+
+    worker_dir = os.environ.get("TEST_WORKER_DIR")
+    if worker_dir:
+        extent_report.save_results(os.path.join(worker_dir, "results.json"))
+        history = DurationHistory(os.path.join(worker_dir, "durations.json"))
+        history.update(test_durations)
+        history.save()
+        results_store.close()
+        logger.info(f"Worker results saved: {worker_dir}")
+        logger.info("=" * 80)
+        return
+
+    if test_durations:
+        history = DurationHistory().load()
+        history.update(test_durations)
+        history.save()
+
+    extent_report.add_summary_table("Startup", ["Phase", "Time (ms)"],
+                                    [[name, f"{seconds * 1000:.0f}"] for name, seconds in framework.startup.items()])
+    if framework.node_registry is not None:
+        extent_report.add_summary_table("Selenium nodes", ["Node", "State", "Max sessions", "Sessions started", "Lost"],
+                                        framework.node_registry.summary_rows())
+    try:
+        for section in results_store.report_sections(run_id):
+            extent_report.add_summary_table(*section)
+    except Exception as e:
+        logger.warning(f"Could not read results history: {e}")
+    results_store.close()
+
     report_path = extent_report.generate_report()
     logger.info(f"Extent Report generated: {report_path}")
     logger.info("=" * 80)
\ No newline at end of file
@@ -0,0 +1,26 @@
+import time
+
+
+class DriverProfiler:
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.on_command = None
+        self._execute = driver.execute
+        driver.execute = self._timed_execute
+
+    @staticmethod
+    def attach(driver):
+        profiler = getattr(driver, "_profiler", None)
+        if profiler is None:
+            profiler = DriverProfiler(driver)
+            driver._profiler = profiler
+        return profiler
+
+    def _timed_execute(self, driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return self._execute(driver_command, params)
+        finally:
+            if self.on_command is not None:
+                self.on_command(driver_command, start, time.perf_counter() - start)
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger("TestAutomation")
+
+
+class DriverResolver:
+
+    _resolved = {}
+
+    def __init__(self, cache_dir=None, offline=None, local_driver=None, ttl=None):
+        self.cache_dir = cache_dir or os.environ.get("DRIVER_CACHE_DIR", ".driver_cache")
+        self.manifest_path = os.path.join(self.cache_dir, "chromedriver_manifest.json")
+        self.lock_path = self.manifest_path + ".lock"
+        if offline is None:
+            offline = os.environ.get("CHROMEDRIVER_OFFLINE", "0") == "1"
+        self.offline = offline
+        self.local_driver = local_driver or os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+        self.ttl = ttl or int(os.environ.get("DRIVER_MANIFEST_TTL", "86400"))
+
+    def resolve(self):
+        resolved = DriverResolver._resolved.get(self.manifest_path)
+        if resolved is None:
+            start = time.perf_counter()
+            resolved = self._resolve()
+            DriverResolver._resolved[self.manifest_path] = resolved
+            logger.info(
+                f"ChromeDriver resolved via {resolved['source']} in {(time.perf_counter() - start) * 1000:.0f}ms: "
+                f"{resolved['driver_path']} (browser {resolved.get('browser_version') or 'unknown'})"
+            )
+        return resolved
+
+    def _resolve(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        browser_version = self._browser_version()
+
+        with self._lock():
+            manifest = self._read_manifest()
+            if self._is_fresh(manifest, browser_version):
+                return dict(manifest, source="manifest")
+
+            if self.offline:
+                logger.info("Offline mode: skipping webdriver-manager")
+                return self._fallback(manifest, browser_version)
+
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                driver_path = ChromeDriverManager().install()
+            except Exception as e:
+                logger.warning(f"webdriver-manager failed, using fallback driver: {e}")
+                return self._fallback(manifest, browser_version)
+
+            manifest = {
+                'driver_path': driver_path,
+                'browser_version': browser_version,
+                'resolved_at': time.time(),
+                'resolved_at_human': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self._write_manifest(manifest)
+            return dict(manifest, source="webdriver-manager")
+
+    def _fallback(self, manifest, browser_version):
+        if manifest and os.path.exists(manifest['driver_path']):
+            return dict(manifest, source="stale manifest")
+        if self.local_driver and os.path.exists(self.local_driver):
+            return {
+                'driver_path': self.local_driver,
+                'browser_version': browser_version,
+                'source': "local binary",
+            }
+        raise RuntimeError(
+            "No ChromeDriver available: manifest is empty and no local binary found "
+            "(set CHROMEDRIVER_PATH or put chromedriver on PATH)"
+        )
+
+    def _is_fresh(self, manifest, browser_version):
+        if not manifest or not os.path.exists(manifest.get('driver_path', "")):
+            return False
+        if browser_version and manifest.get('browser_version') != browser_version:
+            return False
+        return time.time() - manifest.get('resolved_at', 0) < self.ttl
+
+    @staticmethod
+    def _browser_version():
+        try:
+            from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+            return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        except Exception as e:
+            logger.debug(f"Could not detect Chrome version: {e}")
+            return None
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @contextmanager
+    def _lock(self, timeout=300, stale_after=600):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > stale_after:
+                        os.remove(self.lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for driver manifest lock: {self.lock_path}")
+                time.sleep(0.1)
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            yield
+        finally:
+            os.close(fd)
+            try:
+                os.remove(self.lock_path)
+            except OSError:
+                pass
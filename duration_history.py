@@ -0,0 +1,47 @@
+import json
+import os
+
+
+class DurationHistory:
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("TEST_DURATIONS_FILE", ".test_durations.json")
+        self.durations = {}
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.durations = json.load(f)
+        except (OSError, ValueError):
+            self.durations = {}
+        return self
+
+    def update(self, durations, weight=0.5):
+        for nodeid, seconds in durations.items():
+            previous = self.durations.get(nodeid)
+            if previous is None:
+                self.durations[nodeid] = round(seconds, 3)
+            else:
+                self.durations[nodeid] = round(previous * (1 - weight) + seconds * weight, 3)
+
+    def save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def estimate(self, nodeid):
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self.durations:
+            return sum(self.durations.values()) / len(self.durations)
+        return 1.0
+
+    def shard(self, nodeids, workers):
+        shards = [{'tests': [], 'estimate': 0.0} for _ in range(max(1, workers))]
+        by_duration = sorted(nodeids, key=self.estimate, reverse=True)
+        for nodeid in by_duration:
+            target = min(shards, key=lambda s: s['estimate'])
+            target['tests'].append(nodeid)
+            target['estimate'] += self.estimate(nodeid)
+        return shards
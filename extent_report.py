@@ -1,62 +1,19 @@
+import html
+import json
 import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from pathlib import Path
 
-class ExtentReport:
-  
-    def __init__(self, report_name="Test_Execution_Report"):
-        self.report_name = report_name
-        self.report_dir = "reports"
-        self.screenshot_dir = "screenshots"
-        self.tests = []
-        self.start_time = datetime.now()
+from lazy_report import LazyReportWriter
 
-        os.makedirs(self.report_dir, exist_ok=True)
-        os.makedirs(self.screenshot_dir, exist_ok=True)
-        
-    def start_test(self, test_name, description=""):
-        test_info = {
-            'name': test_name,
-            'description': description,
-            'status': 'RUNNING',
-            'start_time': datetime.now(),
-            'end_time': None,
-            'logs': [],
-            'screenshots': [],
-            'error': None
-        }
-        self.tests.append(test_info)
-        return test_info
-    
-    def log(self, test_info, level, message):
-        log_entry = {
-            'time': datetime.now().strftime('%H:%M:%S'),
-            'level': level,
-            'message': message
-        }
-        test_info['logs'].append(log_entry)
-    
-    def add_screenshot(self, test_info, screenshot_path):
-        test_info['screenshots'].append(screenshot_path)
-    
-    def end_test(self, test_info, status, error=None):
-        test_info['status'] = status
-        test_info['end_time'] = datetime.now()
-        test_info['error'] = error
-    
-    def generate_report(self):
-        end_time = datetime.now()
-        duration = (end_time - self.start_time).total_seconds()
-        
-        passed = sum(1 for t in self.tests if t['status'] == 'PASS')
-        failed = sum(1 for t in self.tests if t['status'] == 'FAIL')
-        skipped = sum(1 for t in self.tests if t['status'] == 'SKIP')
-        
-        html_content = f"""
-<!DOCTYPE html>
+REPORT_HEAD = """<!DOCTYPE html>
 <html>
 <head>
-    <title>{self.report_name}</title>
+    <meta charset="utf-8">
+    <title>{title}</title>
     <style>
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
         body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f5f5f5; }}
@@ -93,114 +50,511 @@ class ExtentReport:
         .screenshots {{ margin-top: 15px; }}
         .screenshot {{ margin: 10px 0; }}
         .screenshot img {{ max-width: 100%; border: 1px solid #e5e7eb; border-radius: 4px; cursor: pointer; }}
+        .artifacts {{ margin-top: 15px; }}
+        .artifacts a {{ margin-right: 15px; color: #2563eb; }}
         .screenshot-title {{ font-weight: 600; margin-bottom: 5px; color: #374151; }}
+        .timeline {{ margin-top: 15px; }}
+        .tl-row {{ display: flex; align-items: center; font-size: 12px; height: 18px; }}
+        .tl-label {{ width: 220px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; color: #374151; font-family: 'Courier New', monospace; }}
+        .tl-track {{ flex: 1; position: relative; height: 10px; background: #f3f4f6; border-radius: 2px; }}
+        .tl-bar {{ position: absolute; top: 0; height: 10px; min-width: 2px; border-radius: 2px; }}
+        .tl-command {{ background: #60a5fa; }}
+        .tl-step {{ background: #a78bfa; }}
+        .tl-wait {{ background: #fbbf24; }}
+        .tl-ms {{ width: 80px; text-align: right; color: #6b7280; }}
+        .slowest {{ display: flex; gap: 20px; margin: 20px; }}
+        .slowest-table {{ flex: 1; background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+        .slowest-table h3 {{ font-size: 16px; margin-bottom: 10px; }}
+        .slowest-table table {{ width: 100%; border-collapse: collapse; font-size: 13px; }}
+        .slowest-table th, .slowest-table td {{ text-align: left; padding: 6px 8px; border-bottom: 1px solid #e5e7eb; }}
+        .slowest-table td.num, .slowest-table th.num {{ text-align: right; }}
+        .perf-metrics {{ margin-top: 15px; }}
+        .perf-metrics table {{ border-collapse: collapse; font-size: 13px; margin-top: 5px; }}
+        .perf-metrics th, .perf-metrics td {{ text-align: right; padding: 4px 12px; border-bottom: 1px solid #e5e7eb; }}
+        .perf-metrics th:first-child, .perf-metrics td:first-child {{ text-align: left; }}
+        .trend-up {{ color: #991b1b; }}
+        .trend-down {{ color: #065f46; }}
+        .partial-notice {{ background: #fef3c7; color: #92400e; padding: 15px 20px; margin: 20px; border-radius: 8px; }}
     </style>
+    <script>
+        function toggleDetails(header) {{
+            header.nextElementSibling.classList.toggle('active');
+        }}
+    </script>
 </head>
 <body>
+"""
+
+TIMELINE_LIMIT = 300
+
+REPORT_FOOTER = """
+    </div>
+</body>
+</html>
+"""
+
+
+class TestRecord:
+
+    __slots__ = ('name', 'description', 'markers', 'status', 'start_time', 'perf_start', 'perf_end',
+                 'logs', 'timeline', 'metrics', 'screenshots', 'artifacts', 'attempts', 'error', 'hold', 'written')
+
+    def __init__(self, name, description="", markers=None, hold=False):
+        self.name = name
+        self.description = description
+        self.markers = markers or []
+        self.status = 'RUNNING'
+        self.start_time = time.time()
+        self.perf_start = time.perf_counter()
+        self.perf_end = None
+        self.logs = []
+        self.timeline = []
+        self.metrics = []
+        self.screenshots = []
+        self.artifacts = []
+        self.attempts = []
+        self.error = None
+        self.hold = hold
+        self.written = False
+
+    @property
+    def duration_ms(self):
+        return (self.perf_end - self.perf_start) * 1000 if self.perf_end is not None else 0
+
+    def clock(self, perf_time, millis=True):
+        wall = self.start_time + (perf_time - self.perf_start)
+        formatted = time.strftime('%H:%M:%S', time.localtime(wall))
+        return f"{formatted}.{int(wall % 1 * 1000):03d}" if millis else formatted
+
+
+class ExtentReport:
+  
+    def __init__(self, report_name="Test_Execution_Report", stream_dir=None, mode=None):
+        self.report_name = report_name
+        self.report_dir = "reports"
+        self.screenshot_dir = "screenshots"
+        self.start_time = datetime.now()
+        self.counts = {'total': 0, 'PASS': 0, 'FAIL': 0, 'SKIP': 0}
+        self.stream_dir = stream_dir or self.report_dir
+        self.stream_path = os.path.join(
+            self.stream_dir, f"{self.report_name}_{self.start_time.strftime('%Y%m%d_%H%M%S')}.partial.html"
+        )
+        self._stream = None
+        self._body_offset = 0
+        self._merged_streams = []
+
+        self.mode = mode or os.environ.get("REPORT_MODE", "html")
+        self.lazy_writer = None
+        if self.mode == "lazy":
+            self.lazy_writer = LazyReportWriter(self.report_name, os.path.join(
+                self.stream_dir, f"{self.report_name}_{self.start_time.strftime('%Y%m%d_%H%M%S')}_data"
+            ))
+        self._merged_data_dirs = []
+        self.timings = {}
+        self.summary_tables = []
+        self._lock = threading.Lock()
+
+        os.makedirs(self.report_dir, exist_ok=True)
+        os.makedirs(self.screenshot_dir, exist_ok=True)
+        
+    def start_test(self, test_name, description="", hold=False, markers=None):
+        return TestRecord(test_name, description, markers, hold)
+    
+    def log(self, test_info, level, message):
+        test_info.logs.append((time.perf_counter(), level, message))
+    
+    def add_timing(self, test_info, kind, name, start, duration):
+        test_info.timeline.append((kind, name, (start - test_info.perf_start) * 1000, duration * 1000))
+
+    def add_attempt(self, test_info, number, status, start, duration, error=None):
+        test_info.attempts.append((number, status, (start - test_info.perf_start) * 1000, duration * 1000, error))
+
+    def add_metrics(self, test_info, label, metrics, baseline=None):
+        test_info.metrics.append({'label': label, 'metrics': metrics, 'baseline': baseline or {}})
+
+    @contextmanager
+    def step(self, test_info, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(test_info, "step", name, start, time.perf_counter() - start)
+    
+    def add_screenshot(self, test_info, screenshot_path):
+        test_info.screenshots.append(screenshot_path)
+
+    def add_artifact(self, test_info, label, path):
+        test_info.artifacts.append((label, path))
+    
+    def end_test(self, test_info, status, error=None):
+        test_info.status = status
+        test_info.perf_end = time.perf_counter()
+        test_info.error = error
+        if not test_info.hold:
+            self._write_test(test_info)
+
+    def close_test(self, test_info):
+        if test_info.perf_end is None:
+            test_info.perf_end = time.perf_counter()
+        self._write_test(test_info)
+
+    def _write_test(self, test_info):
+        with self._lock:
+            if test_info.written:
+                return
+            test_info.written = True
+
+            self.counts['total'] += 1
+            if test_info.status in self.counts:
+                self.counts[test_info.status] += 1
+
+            for kind, name, _, duration_ms in test_info.timeline:
+                stats = self.timings.setdefault(kind, {}).setdefault(name, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += duration_ms
+                stats[2] = max(stats[2], duration_ms)
+
+            if self.lazy_writer is not None:
+                if self.lazy_writer.chunk_rows == 0 and self.lazy_writer.chunk_index == 0:
+                    self.lazy_writer.write_shell(
+                        self.stream_path,
+                        [f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}", "Partial report: run in progress"],
+                        [self.lazy_writer.data_dir]
+                    )
+                self.lazy_writer.add(test_info)
+            else:
+                stream = self._open_stream()
+                stream.write(self._render_test(test_info).encode('utf-8'))
+                stream.flush()
+
+        test_info.logs = []
+        test_info.screenshots = []
+        test_info.artifacts = []
+        test_info.timeline = []
+        test_info.metrics = []
+
+    def _open_stream(self):
+        if self._stream is None:
+            os.makedirs(self.stream_dir, exist_ok=True)
+            self._stream = open(self.stream_path, 'wb')
+            self._stream.write(REPORT_HEAD.format(title=html.escape(self.report_name)).encode('utf-8'))
+            self._stream.write(f"""
     <div class="header">
-        <h1>🧪 {self.report_name}</h1>
+        <h1>🧪 {html.escape(self.report_name)}</h1>
         <div class="info">
             <div>Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}</div>
-            <div>End Time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}</div>
-            <div>Duration: {duration:.2f} seconds</div>
         </div>
     </div>
-    
-    <div class="summary">
-        <div class="stat">
-            <div class="number">{len(self.tests)}</div>
-            <div class="label">Total Tests</div>
-        </div>
-        <div class="stat">
-            <div class="number pass">{passed}</div>
-            <div class="label">Passed</div>
-        </div>
-        <div class="stat">
-            <div class="number fail">{failed}</div>
-            <div class="label">Failed</div>
-        </div>
-        <div class="stat">
-            <div class="number skip">{skipped}</div>
-            <div class="label">Skipped</div>
-        </div>
-    </div>
-    
+    <div class="partial-notice">Partial report: the test run has not finished (or was interrupted).</div>
     <div class="tests">
-"""
-        
-        for idx, test in enumerate(self.tests):
-            status_class = test['status'].lower()
-            duration_ms = (test['end_time'] - test['start_time']).total_seconds() * 1000 if test['end_time'] else 0
-            
-            html_content += f"""
+""".encode('utf-8'))
+            self._body_offset = self._stream.tell()
+        return self._stream
+
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    @staticmethod
+    def _render_test(test):
+        status_class = test.status.lower()
+        description = f'<div class="test-description">{html.escape(test.description)}</div>' if test.description else ''
+        error = f'<div class="error-message"><strong>Error:</strong><br>{html.escape(str(test.error))}</div>' if test.error else ''
+
+        parts = [f"""
         <div class="test">
-            <div class="test-header" onclick="toggleDetails({idx})">
-                <div class="test-name">{test['name']}</div>
-                <span class="test-status status-{status_class}">{test['status']}</span>
+            <div class="test-header" onclick="toggleDetails(this)">
+                <div class="test-name">{html.escape(test.name)}</div>
+                <span class="test-status status-{status_class}">{test.status}</span>
             </div>
-            <div class="test-details" id="details-{idx}">
-                {f'<div class="test-description">{test["description"]}</div>' if test['description'] else ''}
+            <div class="test-details">
+                {description}
                 <div class="test-time">
-                    ⏱️ Duration: {duration_ms:.0f}ms | 
-                    Started: {test['start_time'].strftime('%H:%M:%S')} | 
-                    Ended: {test['end_time'].strftime('%H:%M:%S') if test['end_time'] else 'N/A'}
+                    ⏱️ Duration: {test.duration_ms:.0f}ms | 
+                    Started: {test.clock(test.perf_start, millis=False)} | 
+                    Ended: {test.clock(test.perf_end, millis=False) if test.perf_end is not None else 'N/A'}
                 </div>
                 
-                {f'<div class="error-message"><strong>Error:</strong><br>{test["error"]}</div>' if test['error'] else ''}
-                
+                {error}
+                {ExtentReport._render_attempts(test.attempts) if len(test.attempts) > 1 else ''}
                 <div class="logs">
                     <strong>Test Logs:</strong>
-"""
-            
-            for log in test['logs']:
-                log_class = f"log-{log['level'].lower()}"
-                html_content += f"""
-                    <div class="log-entry {log_class}">
-                        [{log['time']}] {log['level']}: {log['message']}
+"""]
+        
+        for logged_at, level, message in test.logs:
+            parts.append(f"""
+                    <div class="log-entry log-{level.lower()}">
+                        [{test.clock(logged_at)}] {level}: {html.escape(str(message))}
                     </div>
-"""
-            
-            html_content += """
+""")
+        
+        parts.append("""
                 </div>
-"""
-            
-            if test['screenshots']:
-                html_content += """
+""")
+
+        if test.timeline:
+            parts.append(ExtentReport._render_timeline(test.timeline))
+
+        for page in test.metrics:
+            parts.append(ExtentReport._render_metrics(page))
+        
+        if test.screenshots:
+            parts.append("""
                 <div class="screenshots">
                     <strong>Screenshots:</strong>
-"""
-                for screenshot in test['screenshots']:
-                    screenshot_name = os.path.basename(screenshot)
-                    html_content += f"""
+""")
+            for screenshot in test.screenshots:
+                screenshot_name = os.path.basename(screenshot)
+                parts.append(f"""
                     <div class="screenshot">
                         <div class="screenshot-title">📸 {screenshot_name}</div>
                         <img src="../{screenshot}" alt="Screenshot" onclick="window.open(this.src)">
                     </div>
+""")
+            parts.append("""
+                </div>
+""")
+
+        if test.artifacts:
+            links = "".join(f'<a href="../{html.escape(path)}" target="_blank">{html.escape(label)}</a>'
+                            for label, path in test.artifacts)
+            parts.append(f"""
+                <div class="artifacts"><strong>Failure artifacts:</strong> {links}</div>
+""")
+        
+        parts.append("""
+            </div>
+        </div>
+""")
+        return "".join(parts)
+
+    @staticmethod
+    def _render_timeline(timeline):
+        total_ms = max(start + duration for _, _, start, duration in timeline) or 1
+        parts = ["""
+                <div class="timeline">
+                    <strong>Timeline:</strong>
+"""]
+        for kind, name, start, duration in timeline[:TIMELINE_LIMIT]:
+            parts.append(f"""
+                    <div class="tl-row"><span class="tl-label" title="{html.escape(name)}">{html.escape(name)}</span><span class="tl-track"><span class="tl-bar tl-{kind}" style="left:{start / total_ms * 100:.2f}%;width:{duration / total_ms * 100:.2f}%"></span></span><span class="tl-ms">{duration:.1f}ms</span></div>
+""")
+        if len(timeline) > TIMELINE_LIMIT:
+            parts.append(f"""
+                    <div class="tl-row">… {len(timeline) - TIMELINE_LIMIT} more entries</div>
+""")
+        parts.append("""
+                </div>
+""")
+        return "".join(parts)
+
+    @staticmethod
+    def _render_attempts(attempts):
+        rows = "".join(
+            f"<tr><td>{number}</td><td>{status}</td><td>+{start:.0f}ms</td><td>{duration:.0f}ms</td>"
+            f"<td>{html.escape(error or '')}</td></tr>"
+            for number, status, start, duration, error in attempts
+        )
+        return f"""
+                <div class="perf-metrics">
+                    <strong>Attempts:</strong>
+                    <table>
+                        <tr><th>Attempt</th><th>Status</th><th>Started</th><th>Duration</th><th>Error</th></tr>
+                        {rows}
+                    </table>
+                </div>
 """
-                html_content += """
+
+    @staticmethod
+    def _render_metrics(page):
+        rows = []
+        for name, value in page['metrics'].items():
+            previous = page['baseline'].get(name)
+            change = ""
+            if previous:
+                delta = (value - previous) / previous * 100
+                trend = "trend-up" if delta > 0 else "trend-down"
+                change = f'<span class="{trend}">{delta:+.1f}%</span>'
+            rows.append(f"<tr><td>{html.escape(name)}</td><td>{value}</td>"
+                        f"<td>{previous if previous is not None else '-'}</td><td>{change}</td></tr>")
+        return f"""
+                <div class="perf-metrics">
+                    <strong>Performance: {html.escape(page['label'])}</strong>
+                    <table>
+                        <tr><th>Metric</th><th>Value</th><th>Previous runs (median)</th><th>Change</th></tr>
+                        {"".join(rows)}
+                    </table>
                 </div>
 """
-            
-            html_content += """
-            </div>
+
+    def _render_slowest(self, limit=15):
+        tables = []
+        for kind, title in (("command", "Slowest WebDriver commands"), ("step", "Slowest steps"), ("wait", "Slowest waits")):
+            stats = self.timings.get(kind)
+            if not stats:
+                continue
+            rows = sorted(stats.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+            body = "".join(
+                f"<tr><td>{html.escape(name)}</td><td class=\"num\">{count}</td><td class=\"num\">{total:.0f}</td>"
+                f"<td class=\"num\">{total / count:.1f}</td><td class=\"num\">{longest:.1f}</td></tr>"
+                for name, (count, total, longest) in rows
+            )
+            tables.append(f"""
+        <div class="slowest-table">
+            <h3>{title}</h3>
+            <table>
+                <tr><th>Name</th><th class="num">Calls</th><th class="num">Total ms</th><th class="num">Avg ms</th><th class="num">Max ms</th></tr>
+                {body}
+            </table>
         </div>
+""")
+        if not tables:
+            return ""
+        return f"""
+    <div class="slowest">{"".join(tables)}
+    </div>
 """
-        
-        html_content += """
+
+    def add_summary_table(self, title, headers, rows):
+        self.summary_tables.append((title, headers, rows))
+
+    def _render_summary_tables(self):
+        tables = []
+        for title, headers, rows in self.summary_tables:
+            head = "".join(f"<th>{html.escape(header)}</th>" for header in headers)
+            body = "".join(
+                "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>"
+                for row in rows
+            )
+            tables.append(f"""
+        <div class="slowest-table">
+            <h3>{html.escape(title)}</h3>
+            <table>
+                <tr>{head}</tr>
+                {body}
+            </table>
+        </div>
+""")
+        if not tables:
+            return ""
+        return f"""
+    <div class="slowest">{"".join(tables)}
     </div>
-    
-    <script>
-        function toggleDetails(idx) {
-            var details = document.getElementById('details-' + idx);
-            details.classList.toggle('active');
-        }
-    </script>
-</body>
-</html>
 """
+
+    def save_results(self, path):
+        self._close_stream()
+        results = {
+            'start_time': self.start_time.isoformat(),
+            'counts': self.counts,
+            'stream_path': None,
+            'body_offset': self._body_offset,
+            'data_dir': None,
+            'timings': self.timings
+        }
+        if self.lazy_writer is not None:
+            self.lazy_writer.close()
+            if os.path.isdir(self.lazy_writer.data_dir):
+                results['data_dir'] = os.path.abspath(self.lazy_writer.data_dir)
+            if os.path.exists(self.stream_path):
+                os.remove(self.stream_path)
+        elif os.path.exists(self.stream_path):
+            results['stream_path'] = os.path.abspath(self.stream_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+
+    def merge_results(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        self.start_time = min(self.start_time, datetime.fromisoformat(results['start_time']))
+        for key, value in results['counts'].items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        if results['stream_path']:
+            self._merged_streams.append((results['stream_path'], results['body_offset']))
+        if results.get('data_dir'):
+            self._merged_data_dirs.append(results['data_dir'])
+        for kind, stats in results.get('timings', {}).items():
+            for name, (count, total, longest) in stats.items():
+                merged = self.timings.setdefault(kind, {}).setdefault(name, [0, 0.0, 0.0])
+                merged[0] += count
+                merged[1] += total
+                merged[2] = max(merged[2], longest)
+    
+    def generate_report(self):
+        end_time = datetime.now()
+        duration = (end_time - self.start_time).total_seconds()
+
+        if self.lazy_writer is not None:
+            return self._generate_lazy_report(end_time, duration)
+
+        own_stream = self._stream is not None
+        self._close_stream()
+        streams = [(self.stream_path, self._body_offset)] if own_stream else []
+        streams.extend(self._merged_streams)
         
         report_filename = f"{self.report_dir}/{self.report_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        with open(report_filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with open(report_filename, 'wb') as report:
+            report.write(REPORT_HEAD.format(title=html.escape(self.report_name)).encode('utf-8'))
+            report.write(f"""
+    <div class="header">
+        <h1>🧪 {html.escape(self.report_name)}</h1>
+        <div class="info">
+            <div>Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}</div>
+            <div>End Time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}</div>
+            <div>Duration: {duration:.2f} seconds</div>
+        </div>
+    </div>
+    
+    <div class="summary">
+        <div class="stat">
+            <div class="number">{self.counts['total']}</div>
+            <div class="label">Total Tests</div>
+        </div>
+        <div class="stat">
+            <div class="number pass">{self.counts['PASS']}</div>
+            <div class="label">Passed</div>
+        </div>
+        <div class="stat">
+            <div class="number fail">{self.counts['FAIL']}</div>
+            <div class="label">Failed</div>
+        </div>
+        <div class="stat">
+            <div class="number skip">{self.counts['SKIP']}</div>
+            <div class="label">Skipped</div>
+        </div>
+    </div>
+    {self._render_slowest()}
+    {self._render_summary_tables()}
+    <div class="tests">
+""".encode('utf-8'))
+
+            for stream_path, body_offset in streams:
+                with open(stream_path, 'rb') as fragments:
+                    fragments.seek(body_offset)
+                    shutil.copyfileobj(fragments, report)
+
+            report.write(REPORT_FOOTER.encode('utf-8'))
+
+        for stream_path, _ in streams:
+            os.remove(stream_path)
+        self._merged_streams = []
         
-        return report_filename
\ No newline at end of file
+        return report_filename
+
+    def _generate_lazy_report(self, end_time, duration):
+        self.lazy_writer.close()
+        data_dirs = [self.lazy_writer.data_dir] if os.path.isdir(self.lazy_writer.data_dir) else []
+        data_dirs.extend(self._merged_data_dirs)
+
+        report_filename = f"{self.report_dir}/{self.report_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+        self.lazy_writer.write_shell(report_filename, [
+            f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"End Time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Duration: {duration:.2f} seconds",
+        ], data_dirs, self._render_slowest() + self._render_summary_tables())
+
+        if os.path.exists(self.stream_path):
+            os.remove(self.stream_path)
+
+        return report_filename
@@ -0,0 +1,150 @@
+import gzip
+import json
+import logging
+import os
+import re
+import uuid
+
+from browser_profiles import execute_cdp
+
+logger = logging.getLogger("TestAutomation")
+
+# Runs in every document the test opens. Console calls, page errors and resource timing entries go
+# into two capped arrays on window; nothing leaves the page unless the test fails and reads them.
+CAPTURE_SCRIPT = """
+(function (config) {
+    if (window.__failureLog && window.__failureLog.token === config.token) return;
+    var log = {token: config.token, console: [], network: [], seen: {console: 0, network: 0}};
+    try {
+        var saved = JSON.parse(sessionStorage.getItem('__failureLog'));
+        if (saved && saved.token === config.token) log = saved;
+    } catch (e) {}
+    window.__failureLog = log;
+
+    function clip(value) {
+        value = String(value);
+        return value.length > config.maxChars ? value.slice(0, config.maxChars) : value;
+    }
+    function push(kind, entry) {
+        var buffer = log[kind];
+        buffer.push(entry);
+        if (buffer.length > config.maxEntries) buffer.shift();
+        log.seen[kind] += 1;
+    }
+    function text(args) {
+        return Array.prototype.map.call(args, function (arg) {
+            if (typeof arg === 'string') return arg;
+            if (arg instanceof Error) return arg.stack || String(arg);
+            try { return JSON.stringify(arg); } catch (e) { return String(arg); }
+        }).join(' ');
+    }
+
+    ['log', 'info', 'warn', 'error', 'debug'].forEach(function (level) {
+        var original = console[level];
+        console[level] = function () {
+            push('console', {timestamp: Date.now(), level: level.toUpperCase(), source: 'console-api',
+                             message: clip(text(arguments))});
+            return original.apply(this, arguments);
+        };
+    });
+    window.addEventListener('error', function (event) {
+        var target = event.target;
+        if (target && target !== window && (target.src || target.href)) {
+            push('network', {timestamp: Date.now(), event: 'loadingFailed', url: clip(target.src || target.href),
+                             type: target.tagName.toLowerCase()});
+        } else {
+            push('console', {timestamp: Date.now(), level: 'SEVERE', source: 'javascript',
+                             message: clip(event.message + ' (' + event.filename + ':' + event.lineno + ')')});
+        }
+    }, true);
+    window.addEventListener('unhandledrejection', function (event) {
+        push('console', {timestamp: Date.now(), level: 'SEVERE', source: 'javascript',
+                         message: clip('Unhandled rejection: ' + text([event.reason]))});
+    });
+
+    function record(list) {
+        list.getEntries().forEach(function (entry) {
+            push('network', {timestamp: Math.round(performance.timeOrigin + entry.startTime), event: entry.entryType,
+                             url: clip(entry.name), type: entry.initiatorType, status: entry.responseStatus,
+                             bytes: entry.transferSize, duration_ms: Math.round(entry.duration)});
+        });
+    }
+    try {
+        new PerformanceObserver(record).observe({type: 'navigation', buffered: true});
+        new PerformanceObserver(record).observe({type: 'resource', buffered: true});
+    } catch (e) {}
+    // same-origin navigations carry the buffer over; a new origin starts an empty one
+    window.addEventListener('pagehide', function () {
+        try { sessionStorage.setItem('__failureLog', JSON.stringify(log)); } catch (e) {}
+    });
+})(%s);
+"""
+
+
+def capture_enabled():
+    return os.environ.get("FAILURE_ARTIFACTS", "1") != "0"
+
+
+class BrowserLogBuffer:
+
+    def __init__(self, max_entries=None, max_chars=None):
+        self.max_entries = max_entries or int(os.environ.get("BROWSER_LOG_BUFFER", "500"))
+        self.max_chars = max_chars or int(os.environ.get("BROWSER_LOG_ENTRY_CHARS", "2000"))
+        self.token = uuid.uuid4().hex
+        self.script_id = None
+
+    def start(self, driver):
+        config = json.dumps({'token': self.token, 'maxEntries': self.max_entries, 'maxChars': self.max_chars})
+        result = execute_cdp(driver, "Page.addScriptToEvaluateOnNewDocument", {"source": CAPTURE_SCRIPT % config})
+        self.script_id = result['identifier']
+        return self
+
+    def stop(self, driver):
+        if self.script_id is not None:
+            execute_cdp(driver, "Page.removeScriptToEvaluateOnNewDocument", {"identifier": self.script_id})
+            self.script_id = None
+
+    def read(self, driver):
+        log = driver.execute_script("return window.__failureLog || null")
+        if not log or log.get('token') != self.token:
+            return None
+        return log
+
+    def write_artifacts(self, driver, directory):
+        os.makedirs(directory, exist_ok=True)
+        artifacts = []
+
+        try:
+            dom = driver.execute_script("return document.documentElement.outerHTML")
+            path = os.path.join(directory, "dom.html.gz")
+            with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.write(dom or "")
+            artifacts.append(("DOM snapshot", path))
+        except Exception as e:
+            logger.warning(f"Could not capture DOM snapshot: {e}")
+
+        log = self.read(driver)
+        if log is None:
+            logger.warning("No browser log buffer on the current page")
+            return artifacts
+        for kind, name in (('console', "Console log"), ('network', "Network log")):
+            entries = log.get(kind) or []
+            path = os.path.join(directory, f"{kind}.jsonl")
+            with open(path, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps({key: value for key, value in entry.items() if value is not None}) + "\n")
+            artifacts.append((self._label(name, log['seen'].get(kind, 0), len(entries)), path))
+        return artifacts
+
+    @staticmethod
+    def _label(name, seen, kept):
+        if seen > kept:
+            return f"{name} (last {kept} of {seen})"
+        return f"{name} ({kept})"
+
+
+def artifact_dir(run_id, test_name, attempt=1):
+    safe_name = re.sub(r"[^\w.-]+", "_", test_name).strip("_")[:100]
+    if attempt > 1:
+        safe_name = f"{safe_name}_attempt{attempt}"
+    return os.path.join(os.environ.get("FAILURE_ARTIFACT_DIR", "artifacts"), run_id, safe_name)
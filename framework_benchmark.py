@@ -0,0 +1,348 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+FRAMEWORK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STATIC_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Benchmark page</title></head>
+<body>
+    <h1 id="title">Benchmark page</h1>
+    <input id="search" type="text">
+    <ul>{items}</ul>
+</body>
+</html>
+"""
+
+BROWSER_TEST_FILE = """import pytest
+
+
+@pytest.mark.usefixtures("setup_method")
+class TestFrameworkOverhead:
+
+    @pytest.mark.parametrize("run", range({tests}))
+    def test_static_page(self, run):
+        self.driver.get(self.base_url)
+        assert self.driver.title == "Benchmark page"
+"""
+
+BROWSER_TIMING_PLUGIN = """import json
+import os
+
+phases = []
+
+
+def pytest_runtest_logreport(report):
+    phases.append({'nodeid': report.nodeid, 'when': report.when,
+                   'duration': report.duration, 'outcome': report.outcome})
+
+
+def pytest_sessionfinish(session, exitstatus):
+    with open(os.environ["BENCHMARK_PHASES_FILE"], 'w', encoding='utf-8') as f:
+        json.dump(phases, f)
+"""
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _report_benchmark(work_dir, tests, logs_per_test, mode, results):
+    sys.path.insert(0, FRAMEWORK_DIR)
+    os.chdir(work_dir)
+    from extent_report import ExtentReport
+
+    baseline_memory = _peak_memory_mb()
+    report = ExtentReport(f"Benchmark_{mode}_{tests}", mode=mode)
+    start = time.perf_counter()
+    for index in range(tests):
+        test_info = report.start_test(f"test_synthetic_{index}", "Synthetic benchmark test")
+        for line in range(logs_per_test):
+            report.log(test_info, "INFO", f"Step {line}: clicked element #item-{line} and waited for the page")
+        if index % 10 == 9:
+            report.end_test(test_info, "FAIL", "AssertionError: expected element to be visible")
+        else:
+            report.end_test(test_info, "PASS")
+    record_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report_path = report.generate_report()
+    generate_time = time.perf_counter() - start
+
+    results.put({
+        'record_s': round(record_time, 4),
+        'generate_s': round(generate_time, 4),
+        'report_mb': round(os.path.getsize(report_path) / (1024 * 1024), 2),
+        'peak_rss_mb': _peak_memory_mb(),
+        'baseline_rss_mb': baseline_memory,
+    })
+
+
+class FrameworkBenchmark:
+
+    def __init__(self, report_sizes=(100, 10000, 100000), logs_per_test=20, browser_tests=10,
+                 log_messages=50000, report_modes=("html", "lazy")):
+        self.report_sizes = report_sizes
+        self.logs_per_test = logs_per_test
+        self.browser_tests = browser_tests
+        self.log_messages = log_messages
+        self.report_modes = report_modes
+        self.work_dir = tempfile.mkdtemp(prefix="framework_benchmark_")
+
+    def run(self, browser=True):
+        os.chdir(self.work_dir)
+        results = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'commit': self._git_commit(),
+                'work_dir': self.work_dir,
+            },
+            'benchmarks': {}
+        }
+        benchmarks = results['benchmarks']
+        benchmarks['startup'] = self.bench_startup()
+        if browser:
+            benchmarks['setup_method'] = self.bench_setup_method()
+        benchmarks['extent_report_calls'] = self.bench_report_calls()
+        for mode in self.report_modes:
+            for tests in self.report_sizes:
+                print(f"generate_report ({mode}): {tests} tests...")
+                benchmarks[f"generate_report_{mode}_{tests}"] = self.bench_generate_report(tests, mode)
+        benchmarks['logging'] = self.bench_logging()
+        return results
+
+    def bench_startup(self, runs=5):
+        print("startup: importing conftest/test_amazon and collecting the suite...")
+        artifact_dirs = [os.path.join(FRAMEWORK_DIR, name) for name in ("logs", "reports", "screenshots")]
+        artifacts_before = sum(len(os.listdir(d)) for d in artifact_dirs if os.path.isdir(d))
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+
+        def median_wall(cmd):
+            times = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(cmd, cwd=FRAMEWORK_DIR, env=env, capture_output=True)
+                times.append(time.perf_counter() - start)
+            return statistics.median(times)
+
+        interpreter = median_wall([sys.executable, "-c", "pass"])
+        imports = median_wall([sys.executable, "-c", "import conftest, test_amazon"])
+        collect = median_wall([sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider"])
+        completed = subprocess.run([sys.executable, "-c", "import conftest, test_amazon, sys; "
+                                    "print(int('selenium.webdriver' in sys.modules))"],
+                                   cwd=FRAMEWORK_DIR, env=env, capture_output=True, text=True)
+        artifacts_after = sum(len(os.listdir(d)) for d in artifact_dirs if os.path.isdir(d))
+        return {
+            'import_ms': round((imports - interpreter) * 1000, 1),
+            'collect_only_ms': round(collect * 1000, 1),
+            'selenium_imported': completed.stdout.strip() == "1",
+            'files_written': artifacts_after - artifacts_before,
+        }
+
+    def bench_setup_method(self):
+        site_dir = os.path.join(self.work_dir, "site")
+        run_dir = os.path.join(self.work_dir, "setup_method")
+        os.makedirs(site_dir, exist_ok=True)
+        os.makedirs(run_dir, exist_ok=True)
+        with open(os.path.join(site_dir, "index.html"), 'w', encoding='utf-8') as f:
+            f.write(STATIC_PAGE.format(items="".join(f"<li>Item {i}</li>" for i in range(200))))
+        with open(os.path.join(run_dir, "test_overhead.py"), 'w', encoding='utf-8') as f:
+            f.write(BROWSER_TEST_FILE.replace("{tests}", str(self.browser_tests)))
+        with open(os.path.join(run_dir, "benchmark_timing.py"), 'w', encoding='utf-8') as f:
+            f.write(BROWSER_TIMING_PLUGIN)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=site_dir))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        phases_file = os.path.join(run_dir, "phases.json")
+        env = dict(os.environ,
+                   PYTHONPATH=os.pathsep.join([FRAMEWORK_DIR, run_dir, os.environ.get("PYTHONPATH", "")]),
+                   BASE_URL=f"http://127.0.0.1:{server.server_address[1]}/index.html",
+                   SITE_MODE="live",
+                   BENCHMARK_PHASES_FILE=phases_file,
+                   TEST_RESULTS_DB=os.path.join(run_dir, "results.db"),
+                   TEST_DURATIONS_FILE=os.path.join(run_dir, "durations.json"),
+                   PERF_HISTORY_FILE=os.path.join(run_dir, "perf_history.jsonl"))
+        cmd = [sys.executable, "-m", "pytest", "test_overhead.py", "-q", "-p", "conftest", "-p", "benchmark_timing",
+               "-p", "no:cacheprovider", "-o", "addopts=", "--rootdir", run_dir]
+        print(f"setup_method: {self.browser_tests} browser tests against a local static page...")
+        start = time.perf_counter()
+        completed = subprocess.run(cmd, cwd=run_dir, env=env, capture_output=True, text=True)
+        session_time = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+
+        try:
+            with open(phases_file, 'r', encoding='utf-8') as f:
+                phases = json.load(f)
+        except (OSError, ValueError):
+            phases = []
+        if completed.returncode != 0 or not phases:
+            output = completed.stdout.strip().splitlines()
+            return {'error': output[-1] if output else f"pytest exited with {completed.returncode}"}
+
+        durations = {when: [p['duration'] for p in phases if p['when'] == when] for when in ("setup", "call", "teardown")}
+        return {
+            'cold_setup_s': round(durations['setup'][0], 4),
+            'warm_setup_median_s': round(statistics.median(durations['setup'][1:] or durations['setup']), 4),
+            'call_median_s': round(statistics.median(durations['call']), 4),
+            'teardown_median_s': round(statistics.median(durations['teardown']), 4),
+            'session_s': round(session_time, 3),
+        }
+
+    def bench_report_calls(self, tests=2000):
+        sys.path.insert(0, FRAMEWORK_DIR)
+        from extent_report import ExtentReport
+
+        report = ExtentReport("Benchmark_calls", stream_dir=os.path.join(self.work_dir, "calls"))
+        log_time = 0.0
+        end_time = 0.0
+        for index in range(tests):
+            test_info = report.start_test(f"test_{index}", "Benchmark")
+            start = time.perf_counter()
+            for line in range(self.logs_per_test):
+                report.log(test_info, "INFO", f"Step {line}: clicked element #item-{line}")
+            log_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            report.end_test(test_info, "PASS")
+            end_time += time.perf_counter() - start
+        report._close_stream()
+        return {
+            'log_us': round(log_time / (tests * self.logs_per_test) * 1e6, 2),
+            'end_test_us': round(end_time / tests * 1e6, 2),
+        }
+
+    def bench_generate_report(self, tests, mode):
+        work_dir = os.path.join(self.work_dir, f"report_{mode}_{tests}")
+        os.makedirs(work_dir, exist_ok=True)
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=_report_benchmark, args=(work_dir, tests, self.logs_per_test, mode, results))
+        process.start()
+        try:
+            result = results.get(timeout=3600)
+        finally:
+            process.join()
+        return result
+
+    def bench_logging(self):
+        sys.path.insert(0, FRAMEWORK_DIR)
+        os.environ["TEST_LOG_DIR"] = os.path.join(self.work_dir, "logs")
+        from log_config import LogConfig
+
+        start = time.perf_counter()
+        logger = LogConfig.setup_logger("FrameworkBenchmark")
+        init_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for index in range(self.log_messages):
+            logger.debug(f"Benchmark message {index}: element located in 12ms")
+        enqueue_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        LogConfig.shutdown()
+        drain_time = time.perf_counter() - start
+        return {
+            'setup_logger_ms': round(init_time * 1000, 3),
+            'per_message_us': round(enqueue_time / self.log_messages * 1e6, 3),
+            'drain_ms': round(drain_time * 1000, 3),
+            'messages_per_s': round(self.log_messages / (enqueue_time + drain_time)),
+        }
+
+    @staticmethod
+    def _git_commit():
+        try:
+            return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=FRAMEWORK_DIR,
+                                  capture_output=True, text=True).stdout.strip() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def compare(current, baseline, threshold=0.2, min_delta=0.005):
+        regressions = []
+        for name, metrics in current['benchmarks'].items():
+            previous = baseline.get('benchmarks', {}).get(name, {})
+            for metric, value in metrics.items():
+                old = previous.get(metric)
+                if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                    continue
+                higher_is_better = metric.endswith("_per_s")
+                change = (old - value) / old if higher_is_better else (value - old) / old
+                if change > threshold and abs(value - old) > min_delta:
+                    regressions.append(f"{name}.{metric}: {old} -> {value} ({change * 100:+.0f}% worse)")
+        return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure the framework's own per-test overhead")
+    parser.add_argument("--output", default="framework_benchmark.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Baseline JSON file; exit with code 1 when a metric regressed")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown that counts as a regression (default 0.2 = 20%%)")
+    parser.add_argument("--sizes", default="100,10000,100000", help="Synthetic suite sizes for generate_report")
+    parser.add_argument("--logs-per-test", type=int, default=20)
+    parser.add_argument("--browser-tests", type=int, default=10)
+    parser.add_argument("--skip-browser", action="store_true", help="Skip the setup_method browser benchmark")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    output = os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+    benchmark = FrameworkBenchmark(
+        report_sizes=[int(size) for size in args.sizes.split(",") if size],
+        logs_per_test=args.logs_per_test,
+        browser_tests=args.browser_tests
+    )
+    results = benchmark.run(browser=not args.skip_browser)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results['benchmarks'], indent=2))
+    print(f"Results written to {output}")
+
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = FrameworkBenchmark.compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions against {args.compare}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+import html
+import json
+import os
+
+LAZY_REPORT_SHELL = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f5f5f5; height: 100vh; display: flex; flex-direction: column; }}
+        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px 30px; }}
+        .header h1 {{ font-size: 24px; margin-bottom: 8px; }}
+        .header .info {{ font-size: 13px; opacity: 0.9; display: flex; gap: 20px; }}
+        .summary {{ display: flex; gap: 30px; padding: 12px 30px; background: white; border-bottom: 1px solid #e5e7eb; font-size: 14px; }}
+        .summary b {{ font-size: 20px; margin-right: 4px; }}
+        .pass {{ color: #10b981; }}
+        .fail {{ color: #ef4444; }}
+        .skip {{ color: #f59e0b; }}
+        .filters {{ display: flex; gap: 12px; padding: 10px 30px; background: #f9fafb; border-bottom: 1px solid #e5e7eb; font-size: 13px; align-items: center; }}
+        .filters input, .filters select {{ padding: 4px 8px; border: 1px solid #d1d5db; border-radius: 4px; }}
+        .main {{ flex: 1; display: flex; min-height: 0; }}
+        #viewport {{ flex: 1; overflow-y: auto; position: relative; }}
+        #spacer {{ position: relative; }}
+        .row {{ position: absolute; left: 0; right: 0; height: 40px; display: flex; align-items: center; gap: 12px; padding: 0 30px; background: white; border-bottom: 1px solid #f3f4f6; cursor: pointer; font-size: 14px; }}
+        .row:hover, .row.selected {{ background: #eef2ff; }}
+        .row .name {{ flex: 1; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; font-weight: 600; }}
+        .row .meta {{ color: #6b7280; font-size: 12px; white-space: nowrap; }}
+        .test-status {{ padding: 3px 12px; border-radius: 20px; font-size: 11px; font-weight: bold; }}
+        .status-pass {{ background: #d1fae5; color: #065f46; }}
+        .status-fail {{ background: #fee2e2; color: #991b1b; }}
+        .status-skip {{ background: #fef3c7; color: #92400e; }}
+        #details {{ width: 45%; overflow-y: auto; padding: 20px; background: #f9fafb; border-left: 1px solid #e5e7eb; display: none; }}
+        #details.active {{ display: block; }}
+        .test-description {{ color: #666; margin-bottom: 15px; font-style: italic; }}
+        .log-entry {{ padding: 6px 10px; margin: 4px 0; border-radius: 4px; font-size: 12px; font-family: 'Courier New', monospace; white-space: pre-wrap; }}
+        .log-info {{ background: #dbeafe; color: #1e40af; }}
+        .log-warning {{ background: #fef3c7; color: #92400e; }}
+        .log-error {{ background: #fee2e2; color: #991b1b; }}
+        .log-pass {{ background: #d1fae5; color: #065f46; }}
+        .error-message {{ background: #fee2e2; color: #991b1b; padding: 12px; border-radius: 4px; margin: 12px 0; border-left: 4px solid #ef4444; white-space: pre-wrap; }}
+        .tl-row {{ display: flex; align-items: center; font-size: 12px; height: 18px; }}
+        .tl-label {{ width: 200px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; font-family: 'Courier New', monospace; }}
+        .tl-track {{ flex: 1; position: relative; height: 10px; background: #e5e7eb; border-radius: 2px; }}
+        .tl-bar {{ position: absolute; top: 0; height: 10px; min-width: 2px; border-radius: 2px; }}
+        .tl-command {{ background: #60a5fa; }}
+        .tl-step {{ background: #a78bfa; }}
+        .tl-wait {{ background: #fbbf24; }}
+        .tl-ms {{ width: 70px; text-align: right; color: #6b7280; }}
+        .slowest {{ display: flex; gap: 20px; padding: 10px 30px; background: white; border-bottom: 1px solid #e5e7eb; max-height: 30vh; overflow-y: auto; }}
+        .slowest-table {{ flex: 1; }}
+        .slowest-table h3 {{ font-size: 14px; margin-bottom: 6px; }}
+        .slowest-table table {{ width: 100%; border-collapse: collapse; font-size: 12px; }}
+        .slowest-table th, .slowest-table td {{ text-align: left; padding: 3px 6px; border-bottom: 1px solid #f3f4f6; }}
+        .slowest-table td.num, .slowest-table th.num {{ text-align: right; }}
+        .perf-metrics table {{ border-collapse: collapse; font-size: 12px; margin: 6px 0 12px; }}
+        .perf-metrics th, .perf-metrics td {{ text-align: right; padding: 3px 10px; border-bottom: 1px solid #e5e7eb; }}
+        .perf-metrics th:first-child, .perf-metrics td:first-child {{ text-align: left; }}
+        .trend-up {{ color: #991b1b; }}
+        .trend-down {{ color: #065f46; }}
+        .screenshot img {{ max-width: 100%; border: 1px solid #e5e7eb; border-radius: 4px; margin-top: 8px; cursor: pointer; }}
+        .artifacts {{ margin-top: 12px; }}
+        .artifacts a {{ margin-right: 15px; color: #2563eb; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🧪 {title}</h1>
+        <div class="info">{info}</div>
+    </div>
+    <div class="summary">
+        <span><b id="count-total">0</b>Total</span>
+        <span class="pass"><b id="count-PASS">0</b>Passed</span>
+        <span class="fail"><b id="count-FAIL">0</b>Failed</span>
+        <span class="skip"><b id="count-SKIP">0</b>Skipped</span>
+        <span id="loading">Loading…</span>
+    </div>
+    {sections}
+    <div class="filters">
+        <input id="filter-name" type="search" placeholder="Filter by name">
+        <select id="filter-status">
+            <option value="">All statuses</option>
+            <option value="PASS">Passed</option>
+            <option value="FAIL">Failed</option>
+            <option value="SKIP">Skipped</option>
+        </select>
+        <select id="filter-marker"><option value="">All markers</option></select>
+        <span id="shown"></span>
+    </div>
+    <div class="main">
+        <div id="viewport"><div id="spacer"></div></div>
+        <div id="details"></div>
+    </div>
+    <script>
+        var SOURCES = {sources};
+        var ROW_HEIGHT = 40;
+        var rows = [], visible = [], markers = {{}}, detailCache = {{}}, detailQueue = Promise.resolve();
+        var counts = {{total: 0, PASS: 0, FAIL: 0, SKIP: 0}};
+        var viewport = document.getElementById('viewport');
+        var spacer = document.getElementById('spacer');
+
+        function pad(n) {{ return ('0000' + n).slice(-5); }}
+        function esc(s) {{ return String(s).replace(/[&<>"]/g, function (c) {{ return {{'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}}[c]; }}); }}
+
+        function loadScript(src) {{
+            return new Promise(function (resolve, reject) {{
+                var script = document.createElement('script');
+                script.src = src;
+                script.onload = function () {{ script.remove(); resolve(); }};
+                script.onerror = function () {{ script.remove(); reject(); }};
+                document.head.appendChild(script);
+            }});
+        }}
+
+        function loadRows(source, chunk) {{
+            var loaded = [];
+            window.R = function (row) {{ loaded.push(row); }};
+            return loadScript(SOURCES[source] + '/rows_' + pad(chunk) + '.js').then(function () {{
+                loaded.forEach(function (row, offset) {{
+                    var test = {{name: row[0], status: row[1], duration: row[2], started: row[3], markers: row[4],
+                                source: source, chunk: chunk, offset: offset}};
+                    rows.push(test);
+                    counts.total++;
+                    if (counts[test.status] !== undefined) counts[test.status]++;
+                    test.markers.forEach(function (m) {{ markers[m] = true; }});
+                }});
+                refresh();
+                return loadRows(source, chunk + 1);
+            }}, function () {{
+                return source + 1 < SOURCES.length ? loadRows(source + 1, 0) : null;
+            }});
+        }}
+
+        function refresh() {{
+            Object.keys(counts).forEach(function (k) {{ document.getElementById('count-' + k).textContent = counts[k]; }});
+            var select = document.getElementById('filter-marker');
+            Object.keys(markers).sort().forEach(function (m) {{
+                if (!select.querySelector('option[value="' + m + '"]')) select.add(new Option(m, m));
+            }});
+            applyFilters();
+        }}
+
+        function applyFilters() {{
+            var name = document.getElementById('filter-name').value.toLowerCase();
+            var status = document.getElementById('filter-status').value;
+            var marker = document.getElementById('filter-marker').value;
+            visible = rows.filter(function (t) {{
+                return (!status || t.status === status) &&
+                       (!marker || t.markers.indexOf(marker) !== -1) &&
+                       (!name || t.name.toLowerCase().indexOf(name) !== -1);
+            }});
+            document.getElementById('shown').textContent = visible.length + ' shown';
+            spacer.style.height = (visible.length * ROW_HEIGHT) + 'px';
+            render();
+        }}
+
+        function render() {{
+            var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - 10);
+            var last = Math.min(visible.length, first + Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 20);
+            var out = [];
+            for (var i = first; i < last; i++) {{
+                var t = visible[i];
+                out.push('<div class="row" style="top:' + (i * ROW_HEIGHT) + 'px" onclick="showDetails(' + i + ')">' +
+                         '<span class="name">' + esc(t.name) + '</span>' +
+                         '<span class="meta">' + esc(t.markers.join(', ')) + '</span>' +
+                         '<span class="meta">' + t.started + ' · ' + t.duration + 'ms</span>' +
+                         '<span class="test-status status-' + t.status.toLowerCase() + '">' + t.status + '</span></div>');
+            }}
+            spacer.innerHTML = out.join('');
+        }}
+
+        function loadDetails(test) {{
+            var key = test.source + ':' + test.chunk;
+            if (!detailCache[key]) {{
+                detailCache[key] = detailQueue = detailQueue.then(function () {{
+                    var loaded = [];
+                    window.D = function (detail) {{ loaded.push(detail); }};
+                    return loadScript(SOURCES[test.source] + '/details_' + pad(test.chunk) + '.js').then(function () {{ return loaded; }});
+                }});
+            }}
+            return detailCache[key].then(function (details) {{ return details[test.offset]; }});
+        }}
+
+        function showDetails(index) {{
+            var test = visible[index];
+            var panel = document.getElementById('details');
+            panel.classList.add('active');
+            panel.innerHTML = '<h2>' + esc(test.name) + '</h2><p>Loading…</p>';
+            loadDetails(test).then(function (d) {{
+                var out = ['<h2>' + esc(test.name) + '</h2>'];
+                if (d.description) out.push('<div class="test-description">' + esc(d.description) + '</div>');
+                out.push('<div class="meta">⏱️ Duration: ' + test.duration + 'ms | Started: ' + test.started + '</div>');
+                if (d.error) out.push('<div class="error-message"><strong>Error:</strong><br>' + esc(d.error) + '</div>');
+                if (d.attempts && d.attempts.length > 1) {{
+                    out.push('<div class="perf-metrics"><strong>Attempts:</strong><table>' +
+                             '<tr><th>Attempt</th><th>Status</th><th>Started</th><th>Duration</th><th>Error</th></tr>');
+                    d.attempts.forEach(function (a) {{
+                        out.push('<tr><td>' + a[0] + '</td><td>' + a[1] + '</td><td>+' + a[2] + 'ms</td><td>' + a[3] + 'ms</td><td>' + esc(a[4] || '') + '</td></tr>');
+                    }});
+                    out.push('</table></div>');
+                }}
+                out.push('<strong>Test Logs:</strong>');
+                d.logs.forEach(function (log) {{
+                    out.push('<div class="log-entry log-' + log[1].toLowerCase() + '">[' + log[0] + '] ' + log[1] + ': ' + esc(log[2]) + '</div>');
+                }});
+                if (d.timeline && d.timeline.length) {{
+                    var total = Math.max.apply(null, d.timeline.map(function (e) {{ return e[2] + e[3]; }})) || 1;
+                    out.push('<div class="timeline"><strong>Timeline:</strong>');
+                    d.timeline.forEach(function (e) {{
+                        out.push('<div class="tl-row"><span class="tl-label" title="' + esc(e[1]) + '">' + esc(e[1]) + '</span>' +
+                                 '<span class="tl-track"><span class="tl-bar tl-' + e[0] + '" style="left:' + (e[2] / total * 100) + '%;width:' + (e[3] / total * 100) + '%"></span></span>' +
+                                 '<span class="tl-ms">' + e[3].toFixed(1) + 'ms</span></div>');
+                    }});
+                    out.push('</div>');
+                }}
+                (d.metrics || []).forEach(function (page) {{
+                    out.push('<div class="perf-metrics"><strong>Performance: ' + esc(page.label) + '</strong><table>' +
+                             '<tr><th>Metric</th><th>Value</th><th>Previous runs (median)</th><th>Change</th></tr>');
+                    Object.keys(page.metrics).forEach(function (name) {{
+                        var value = page.metrics[name], previous = page.baseline[name], change = '';
+                        if (previous) {{
+                            var delta = (value - previous) / previous * 100;
+                            change = '<span class="' + (delta > 0 ? 'trend-up' : 'trend-down') + '">' + (delta > 0 ? '+' : '') + delta.toFixed(1) + '%</span>';
+                        }}
+                        out.push('<tr><td>' + esc(name) + '</td><td>' + value + '</td><td>' + (previous === undefined ? '-' : previous) + '</td><td>' + change + '</td></tr>');
+                    }});
+                    out.push('</table></div>');
+                }});
+                d.screenshots.forEach(function (path) {{
+                    out.push('<div class="screenshot"><strong>📸 ' + esc(path.split('/').pop()) + '</strong>' +
+                             '<img src="../' + esc(path) + '" onclick="window.open(this.src)"></div>');
+                }});
+                if (d.artifacts && d.artifacts.length) {{
+                    out.push('<div class="artifacts"><strong>Failure artifacts:</strong> ' + d.artifacts.map(function (a) {{
+                        return '<a href="../' + esc(a[1]) + '" target="_blank">' + esc(a[0]) + '</a>';
+                    }}).join('') + '</div>');
+                }}
+                panel.innerHTML = out.join('');
+            }});
+        }}
+
+        viewport.addEventListener('scroll', function () {{ window.requestAnimationFrame(render); }});
+        ['filter-name', 'filter-status', 'filter-marker'].forEach(function (id) {{
+            document.getElementById(id).addEventListener('input', applyFilters);
+        }});
+        loadRows(0, 0).then(function () {{ document.getElementById('loading').textContent = ''; }});
+    </script>
+</body>
+</html>
+"""
+
+
+class LazyReportWriter:
+
+    def __init__(self, report_name, data_dir, chunk_size=None):
+        self.report_name = report_name
+        self.data_dir = data_dir
+        self.chunk_size = chunk_size or int(os.environ.get("REPORT_CHUNK_SIZE", "1000"))
+        self.chunk_index = 0
+        self.chunk_rows = 0
+        self._rows = None
+        self._details = None
+
+    def add(self, test_info):
+        if self._rows is None or self.chunk_rows >= self.chunk_size:
+            self._next_chunk()
+
+        row = [
+            test_info.name,
+            test_info.status,
+            round(test_info.duration_ms),
+            test_info.clock(test_info.perf_start, millis=False),
+            test_info.markers,
+        ]
+        detail = {
+            'description': test_info.description,
+            'error': str(test_info.error) if test_info.error else None,
+            'logs': [[test_info.clock(logged_at), level, str(message)] for logged_at, level, message in test_info.logs],
+            'screenshots': test_info.screenshots,
+            'artifacts': test_info.artifacts,
+            'timeline': [[kind, name, round(start, 1), round(duration, 1)]
+                         for kind, name, start, duration in test_info.timeline],
+            'metrics': test_info.metrics,
+            'attempts': [[number, status, round(start), round(duration), error]
+                         for number, status, start, duration, error in test_info.attempts],
+        }
+        self._rows.write(f"R({json.dumps(row, separators=(',', ':'))});\n")
+        self._details.write(f"D({json.dumps(detail, separators=(',', ':'))});\n")
+        self._rows.flush()
+        self._details.flush()
+        self.chunk_rows += 1
+
+    def _next_chunk(self):
+        if self._rows is not None:
+            self.close()
+            self.chunk_index += 1
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._rows = open(os.path.join(self.data_dir, f"rows_{self.chunk_index:05d}.js"), 'w', encoding='utf-8')
+        self._details = open(os.path.join(self.data_dir, f"details_{self.chunk_index:05d}.js"), 'w', encoding='utf-8')
+        self.chunk_rows = 0
+
+    def close(self):
+        if self._rows is not None:
+            self._rows.close()
+            self._details.close()
+
+    def write_shell(self, path, info, data_dirs, sections=""):
+        report_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(report_dir, exist_ok=True)
+        sources = [os.path.relpath(d, report_dir).replace(os.sep, "/") for d in data_dirs]
+        info_html = "".join(f"<div>{html.escape(item)}</div>" for item in info)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(LAZY_REPORT_SHELL.format(
+                title=html.escape(self.report_name),
+                info=info_html,
+                sections=sections,
+                sources=json.dumps(sources),
+            ))
+        return path
@@ -1,12 +1,93 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 
+
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class TimedLogger(logging.Logger):
+
+    # the whole call on the test thread: caller lookup, record creation, message formatting and enqueue
+    def _log(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            super()._log(*args, **kwargs)
+        finally:
+            self.call_time += time.perf_counter() - start
+            self.records += 1
+
+
+class BatchQueueListener:
+
+    def __init__(self, log_queue, handlers, batch_size=500, flush_interval=0.5):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._stop = object()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self.queue.put(self._stop)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = self._stop in batch
+            self._handle([record for record in batch if record is not self._stop])
+            if stopping:
+                return
+
+    def _handle(self, records):
+        for handler in self.handlers:
+            for record in records:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            if isinstance(handler, BatchRotatingFileHandler):
+                handler.flush_batch()
+            else:
+                handler.flush()
+
+
 class LogConfig:
-    
+
+    _loggers = {}
+    _listeners = []
+
     @staticmethod
     def setup_logger(name="TestAutomation"):
-        log_dir = "logs"
+        if name in LogConfig._loggers:
+            return LogConfig._loggers[name]
+
+        log_dir = os.environ.get("TEST_LOG_DIR", "logs")
         os.makedirs(log_dir, exist_ok=True)
 
         logger = logging.getLogger(name)
@@ -16,17 +97,25 @@ class LogConfig:
             logger.handlers.clear()
 
         detailed_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - [%(levelname)s] - %(filename)s:%(lineno)d - %(message)s',
+            '%(asctime)s - %(name)s - [%(levelname)s] - [%(threadName)s] - %(filename)s:%(lineno)d - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
-        
+
         simple_formatter = logging.Formatter(
             '%(asctime)s - [%(levelname)s] - %(message)s',
             datefmt='%H:%M:%S'
         )
 
-        log_filename = f"{log_dir}/test_execution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        file_handler = logging.FileHandler(log_filename, mode='w', encoding='utf-8')
+        worker_id = os.environ.get("TEST_WORKER_ID")
+        worker_suffix = f"_{worker_id}" if worker_id else ""
+        log_filename = f"{log_dir}/test_execution{worker_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        file_handler = BatchRotatingFileHandler(
+            log_filename,
+            mode='w',
+            maxBytes=int(os.environ.get("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.environ.get("LOG_BACKUP_COUNT", "5")),
+            encoding='utf-8'
+        )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(detailed_formatter)
 
@@ -34,12 +123,41 @@ class LogConfig:
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(simple_formatter)
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-        
+        log_queue = queue.SimpleQueue()
+        listener = BatchQueueListener(log_queue, [file_handler, console_handler])
+        listener.start()
+        LogConfig._listeners.append(listener)
+
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        # root handlers (pytest's live log and capture) would format and write on the test thread
+        logger.propagate = False
+        logger.__class__ = TimedLogger
+        logger.records = 0
+        logger.call_time = 0.0
+        LogConfig._loggers[name] = logger
+
         logger.info("=" * 80)
         logger.info("Logger initialized successfully")
         logger.info(f"Log file: {log_filename}")
         logger.info("=" * 80)
-        
-        return logger
\ No newline at end of file
+
+        return logger
+
+    @staticmethod
+    def stats(name="TestAutomation"):
+        logger = LogConfig._loggers.get(name)
+        records = logger.records if logger else 0
+        call_time = logger.call_time if logger else 0.0
+        return {
+            'records': records,
+            'call_time': call_time,
+            'per_record_us': call_time / records * 1e6 if records else 0.0
+        }
+
+    @staticmethod
+    def shutdown():
+        while LogConfig._listeners:
+            LogConfig._listeners.pop().stop()
+
+
+atexit.register(LogConfig.shutdown)
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+
+logger = logging.getLogger("TestAutomation")
+
+
+class SeleniumNode:
+
+    def __init__(self, url, max_sessions=1):
+        self.url = url.rstrip("/")
+        self.max_sessions = max_sessions
+        self.active = 0
+        self.healthy = True
+        self.sessions_started = 0
+        self.sessions_lost = 0
+
+    @property
+    def load(self):
+        return self.active / self.max_sessions
+
+    def describe(self):
+        state = "up" if self.healthy else "down"
+        return f"{self.url} ({state}, {self.active}/{self.max_sessions} sessions)"
+
+
+def parse_nodes(spec, default_sessions=1):
+    nodes = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        url, _, sessions = entry.rpartition("=")
+        if url and sessions.isdigit():
+            nodes.append(SeleniumNode(url, int(sessions)))
+        else:
+            nodes.append(SeleniumNode(entry, default_sessions))
+    return nodes
+
+
+def configured_nodes():
+    return parse_nodes(os.environ.get("SELENIUM_NODES", ""), int(os.environ.get("NODE_MAX_SESSIONS", "1")))
+
+
+class NodeRegistry:
+
+    def __init__(self, nodes, health_interval=None, acquire_timeout=None):
+        self.nodes = nodes
+        self.health_interval = health_interval or float(os.environ.get("NODE_HEALTH_INTERVAL", "10"))
+        self.acquire_timeout = acquire_timeout or float(os.environ.get("NODE_ACQUIRE_TIMEOUT", "120"))
+        self._sessions = {}
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_env(cls):
+        nodes = configured_nodes()
+        return cls(nodes) if nodes else None
+
+    @property
+    def capacity(self):
+        return sum(node.max_sessions for node in self.nodes)
+
+    def start(self):
+        healthy = [node for node in self.nodes if self.check(node)]
+        logger.info(f"Selenium nodes: {len(healthy)}/{len(self.nodes)} healthy, "
+                    f"capacity {sum(node.max_sessions for node in healthy)} sessions")
+        threading.Thread(target=self._monitor, name="node-health", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def check(self, node):
+        try:
+            with urllib.request.urlopen(f"{node.url}/status", timeout=5) as response:
+                ready = bool(json.load(response).get('value', {}).get('ready'))
+        except (OSError, ValueError):
+            ready = False
+        with self._condition:
+            if ready != node.healthy:
+                if ready:
+                    logger.info(f"Selenium node is back: {node.url}")
+                else:
+                    logger.warning(f"Selenium node is down: {node.url}")
+            node.healthy = ready
+            self._condition.notify_all()
+        return ready
+
+    def acquire(self, reclaim=None):
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._condition:
+                candidates = [node for node in self.nodes if node.healthy and node.active < node.max_sessions]
+                if candidates:
+                    node = min(candidates, key=lambda n: (n.load, n.active))
+                    node.active += 1
+                    return node
+                if time.monotonic() > deadline:
+                    raise RuntimeError("No Selenium node has a free session: " +
+                                       ", ".join(node.describe() for node in self.nodes))
+            # idle pooled browsers hold sessions too; closing one frees a slot for this request
+            if reclaim is not None and reclaim():
+                continue
+            with self._condition:
+                self._condition.wait(timeout=1)
+
+    def register(self, driver, node):
+        with self._condition:
+            self._sessions[driver.session_id] = node
+            node.sessions_started += 1
+
+    def release(self, driver):
+        with self._condition:
+            node = self._sessions.pop(getattr(driver, "session_id", None), None)
+        if node is not None:
+            self.release_node(node)
+
+    def release_node(self, node):
+        with self._condition:
+            node.active -= 1
+            self._condition.notify_all()
+
+    def node_for(self, driver):
+        return self._sessions.get(getattr(driver, "session_id", None))
+
+    def lost(self, driver):
+        node = self.node_for(driver)
+        if node is None or self.check(node):
+            return False
+        node.sessions_lost += 1
+        return True
+
+    def summary_rows(self):
+        return [[node.url, "up" if node.healthy else "down", str(node.max_sessions),
+                 str(node.sessions_started), str(node.sessions_lost)] for node in self.nodes]
+
+    def _monitor(self):
+        while not self._stopped.wait(self.health_interval):
+            for node in self.nodes:
+                self.check(node)
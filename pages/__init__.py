@@ -0,0 +1,19 @@
+import importlib
+
+_EXPORTS = {
+    'BasePage': 'pages.base_page',
+    'AMAZON_URL': 'pages.amazon_pages',
+    'AmazonHomePage': 'pages.amazon_pages',
+    'AmazonSearchResultsPage': 'pages.amazon_pages',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    # page objects pull in selenium.webdriver, so they load on first use rather than at collection
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'pages' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,75 @@
+from urllib.parse import quote_plus
+
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage, css_for
+
+AMAZON_URL = "https://www.amazon.com"
+
+RESULTS_MENTION_SCRIPT = """
+var query = arguments[1].toLowerCase();
+return arguments[0].some(function (el) { return (el.innerText || '').toLowerCase().indexOf(query) !== -1; });
+"""
+
+RESULTS_SUMMARY_SCRIPT = """
+var nodes = document.querySelectorAll(arguments[0]), text = arguments[1].toLowerCase(), mentions = 0;
+for (var i = 0; i < nodes.length; i++) {
+    if ((nodes[i].innerText || '').toLowerCase().indexOf(text) !== -1) mentions++;
+}
+return {count: nodes.length, mentions: mentions, ready: document.readyState === 'complete'};
+"""
+
+
+class AmazonHomePage(BasePage):
+
+    URL = "/"
+    LOCATORS = {
+        'logo': (By.ID, "nav-logo-sprites"),
+        'search_box': (By.ID, "twotabsearchtextbox"),
+        'search_button': (By.ID, "nav-search-submit-button"),
+        'nav_main': (By.ID, "nav-main"),
+        'menu_button': (By.ID, "nav-hamburger-menu"),
+    }
+
+    def __init__(self, driver, wait=None, base_url=AMAZON_URL):
+        super().__init__(driver, wait, base_url)
+
+    def search(self, query):
+        search_box, search_button = self.wait_for('search_box', 'search_button')
+        search_box.clear()
+        search_box.send_keys(query)
+        search_button.click()
+        self.invalidate()
+        return AmazonSearchResultsPage(self.driver, self.wait, self.base_url)
+
+
+class AmazonSearchResultsPage(BasePage):
+
+    URL = "/s"
+    LOCATORS = {
+        'results': (By.CSS_SELECTOR, "[data-component-type='s-search-result']"),
+        'captcha': (By.CSS_SELECTOR, "form[action='/errors/validateCaptcha']"),
+    }
+    MULTI = ('results',)
+
+    def __init__(self, driver, wait=None, base_url=AMAZON_URL):
+        super().__init__(driver, wait, base_url)
+
+    def results(self):
+        # a robot check never turns into results, so stop waiting as soon as it shows up
+        if self.wait_for_any('results', 'captcha') == 'captcha':
+            raise RuntimeError("Amazon served a captcha page instead of search results")
+        return self.element('results')
+
+    def results_mention(self, query):
+        self.round_trips += 1
+        return self.driver.execute_script(RESULTS_MENTION_SCRIPT, self.element('results'), query)
+
+    def open_query(self, query):
+        self.driver.get(f"{self.url}?k={quote_plus(query)}")
+        self.invalidate()
+        return self
+
+    def summary(self, text):
+        self.round_trips += 1
+        return self.driver.execute_script(RESULTS_SUMMARY_SCRIPT, css_for(*self.LOCATORS['results']), text)
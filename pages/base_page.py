@@ -0,0 +1,123 @@
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from smart_wait import any_of
+
+FIND_ELEMENTS_SCRIPT = """
+var locators = arguments[0], found = [];
+for (var i = 0; i < locators.length; i++) {
+    var by = locators[i][0], value = locators[i][1], many = locators[i][2], nodes = [];
+    if (by === 'xpath') {
+        var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var j = 0; j < result.snapshotLength; j++) nodes.push(result.snapshotItem(j));
+    } else {
+        nodes = Array.prototype.slice.call(document.querySelectorAll(value));
+    }
+    found.push(many ? nodes : (nodes.length ? nodes[0] : null));
+}
+return found;
+"""
+
+DESCRIBE_ELEMENTS_SCRIPT = """
+return arguments[0].map(function (el) {
+    if (!el) return {present: false, displayed: false, text: ''};
+    var rect = el.getBoundingClientRect(), style = window.getComputedStyle(el);
+    return {
+        present: true,
+        displayed: rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none',
+        text: (el.innerText || el.value || '').trim()
+    };
+});
+"""
+
+
+def css_for(by, value):
+    if by == By.ID:
+        return f'[id="{value}"]'
+    if by == By.NAME:
+        return f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return f".{value}"
+    if by == By.TAG_NAME:
+        return value
+    return value
+
+
+class BasePage:
+
+    URL = None
+    LOCATORS = {}
+    MULTI = ()
+
+    def __init__(self, driver, wait=None, base_url=None):
+        self.driver = driver
+        self.wait = wait
+        self.base_url = base_url
+        self._elements = {}
+        self.round_trips = 0
+
+    def open(self):
+        self.driver.get(self.url)
+        self.invalidate()
+        return self
+
+    @property
+    def url(self):
+        return f"{self.base_url.rstrip('/')}{self.URL}" if self.base_url else self.URL
+
+    def invalidate(self):
+        self._elements = {}
+
+    def element(self, name):
+        return self.elements(name)[0]
+
+    def elements(self, *names):
+        missing = [name for name in names if self._elements.get(name) is None]
+        if missing:
+            self._resolve(missing)
+        return [self._elements.get(name) for name in names]
+
+    def describe(self, *names):
+        elements = self.elements(*names)
+        try:
+            self.round_trips += 1
+            states = self.driver.execute_script(DESCRIBE_ELEMENTS_SCRIPT, elements)
+        except StaleElementReferenceException:
+            self.invalidate()
+            elements = self.elements(*names)
+            self.round_trips += 1
+            states = self.driver.execute_script(DESCRIBE_ELEMENTS_SCRIPT, elements)
+        return dict(zip(names, states))
+
+    def present(self, *names):
+        def _present(driver):
+            self.invalidate()
+            elements = self.elements(*names)
+            return elements if all(elements) else False
+        return _present
+
+    def wait_for(self, *names, timeout=None):
+        if self.wait is None:
+            raise TimeoutException("No wait configured for page object")
+        return self.wait.until(self.present(*names), timeout=timeout,
+                               name=f"{type(self).__name__}: {', '.join(names)}")
+
+    def wait_for_any(self, *names, timeout=None):
+        if self.wait is None:
+            raise TimeoutException("No wait configured for page object")
+        # each condition yields its own name, so the caller learns which element showed up first
+        conditions = [lambda driver, name=name: self.present(name)(driver) and name for name in names]
+        return self.wait.until(any_of(*conditions), timeout=timeout,
+                               name=f"{type(self).__name__}: any of {', '.join(names)}")
+
+    def _resolve(self, names):
+        locators = []
+        for name in names:
+            by, value = self.LOCATORS[name]
+            query = value if by == By.XPATH else css_for(by, value)
+            locators.append([by if by == By.XPATH else "css", query, name in self.MULTI])
+        self.round_trips += 1
+        found = self.driver.execute_script(FIND_ELEMENTS_SCRIPT, locators)
+        for name, element in zip(names, found):
+            if element:
+                self._elements[name] = element
@@ -0,0 +1,136 @@
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from duration_history import DurationHistory
+from extent_report import ExtentReport
+from results_store import ResultsStore
+
+
+class ParallelRunner:
+
+    def __init__(self, workers, test_path="test_amazon.py", marker=None,
+                 report_name="Selenium_Test_Execution_Report"):
+        self.workers = workers
+        self.test_path = test_path
+        self.marker = marker
+        self.report_name = report_name
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.run_dir = os.path.join("reports", "workers", self.run_id)
+        self.history = DurationHistory().load()
+
+    def collect(self):
+        cmd = [sys.executable, "-m", "pytest", self.test_path, "--collect-only", "-q",
+               "-o", "addopts=", "-o", "log_cli=false"]
+        cmd.extend(self._marker_args())
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode not in (0, 5):
+            print(result.stdout + result.stderr)
+            print(f"Test collection failed (pytest exit code {result.returncode})")
+        return result.returncode, self.parse_collected(result.stdout)
+
+    @staticmethod
+    def parse_collected(output):
+        # one node id per line; parametrize ids may contain spaces, so only the path part is checked
+        return [line for line in output.splitlines()
+                if "::" in line and not line[:1].isspace() and line.split("::", 1)[0].endswith(".py")]
+
+    def run(self, nodeids=None):
+        if not nodeids:
+            returncode, nodeids = self.collect()
+            if returncode not in (0, 5):
+                return returncode
+        if not nodeids:
+            print("No tests collected")
+            return 5
+
+        shards = [s for s in self.history.shard(nodeids, self.workers) if s['tests']]
+        print(f"Collected {len(nodeids)} tests, running on {len(shards)} workers")
+
+        os.makedirs(self.run_dir, exist_ok=True)
+        processes = []
+        for index, shard in enumerate(shards):
+            worker_id = f"gw{index}"
+            processes.append(self._start_worker(worker_id, shard))
+            print(f"  [{worker_id}] {len(shard['tests'])} tests, estimated {shard['estimate']:.1f}s")
+
+        exit_code = 0
+        for worker_id, worker_dir, process, output, started in processes:
+            returncode = process.wait()
+            output.close()
+            elapsed = time.perf_counter() - started
+            print(f"  [{worker_id}] finished in {elapsed:.1f}s (exit code {returncode})")
+            if returncode not in (0, 5):
+                exit_code = exit_code or returncode
+
+        report_path = self.merge([worker_dir for _, worker_dir, _, _, _ in processes])
+        print(f"Merged Extent Report: {report_path}")
+        return exit_code
+
+    def merge(self, worker_dirs):
+        report = ExtentReport(self.report_name)
+        merged_log = os.path.join("logs", f"test_execution_{os.path.basename(self.run_dir)}.log")
+        os.makedirs("logs", exist_ok=True)
+
+        with open(merged_log, 'w', encoding='utf-8') as log_out:
+            for worker_dir in worker_dirs:
+                results_path = os.path.join(worker_dir, "results.json")
+                if os.path.exists(results_path):
+                    report.merge_results(results_path)
+
+                durations_path = os.path.join(worker_dir, "durations.json")
+                if os.path.exists(durations_path):
+                    self.history.update(DurationHistory(durations_path).load().durations)
+
+                for log_path in self.log_files(worker_dir):
+                    log_out.write(f"===== {os.path.basename(worker_dir)}: {os.path.basename(log_path)} =====\n")
+                    with open(log_path, 'r', encoding='utf-8') as log_in:
+                        shutil.copyfileobj(log_in, log_out)
+
+        self.history.save()
+
+        store = ResultsStore()
+        try:
+            for section in store.report_sections(self.run_id):
+                report.add_summary_table(*section)
+        finally:
+            store.close()
+        return report.generate_report()
+
+    @staticmethod
+    def log_files(worker_dir):
+        paths = []
+        for log_path in sorted(glob.glob(os.path.join(worker_dir, "*.log"))):
+            backups = [path for path in glob.glob(glob.escape(log_path) + ".*")
+                       if path.rsplit(".", 1)[1].isdigit()]
+            # RotatingFileHandler keeps the oldest content in the highest-numbered backup
+            paths.extend(sorted(backups, key=lambda path: int(path.rsplit(".", 1)[1]), reverse=True))
+            paths.append(log_path)
+        return paths
+
+    def _start_worker(self, worker_id, shard):
+        worker_dir = os.path.join(self.run_dir, worker_id)
+        os.makedirs(worker_dir, exist_ok=True)
+        shard_file = os.path.join(worker_dir, "shard.txt")
+        with open(shard_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(shard['tests']))
+
+        env = dict(os.environ,
+                   TEST_RUN_ID=self.run_id,
+                   TEST_WORKER_ID=worker_id,
+                   TEST_WORKER_DIR=worker_dir,
+                   TEST_SHARD_FILE=shard_file,
+                   TEST_LOG_DIR=worker_dir)
+        cmd = [sys.executable, "-m", "pytest", self.test_path]
+        cmd.extend(self._marker_args())
+
+        output = open(os.path.join(worker_dir, "output.txt"), 'w', encoding='utf-8')
+        process = subprocess.Popen(cmd, env=env, stdout=output, stderr=subprocess.STDOUT)
+        return worker_id, worker_dir, process, output, time.perf_counter()
+
+    def _marker_args(self):
+        return ["-m", self.marker] if self.marker else []
@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import statistics
+import threading
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("TestAutomation")
+
+COLLECT_METRICS_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var result = {url: location.href};
+var nav = performance.getEntriesByType('navigation')[0];
+if (nav) {
+    result.ttfb_ms = nav.responseStart;
+    result.dom_content_loaded_ms = nav.domContentLoadedEventEnd;
+    result.load_ms = nav.loadEventEnd;
+    result.document_bytes = nav.transferSize;
+}
+performance.getEntriesByType('paint').forEach(function (entry) {
+    if (entry.name === 'first-paint') result.fp_ms = entry.startTime;
+    if (entry.name === 'first-contentful-paint') result.fcp_ms = entry.startTime;
+});
+var resources = performance.getEntriesByType('resource');
+result.resource_count = resources.length;
+result.resource_bytes = resources.reduce(function (sum, r) { return sum + (r.transferSize || 0); }, 0);
+var lcp = 0, cls = 0;
+try {
+    new PerformanceObserver(function (list) {
+        list.getEntries().forEach(function (e) { lcp = Math.max(lcp, e.renderTime || e.loadTime || e.startTime); });
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+    new PerformanceObserver(function (list) {
+        list.getEntries().forEach(function (e) { if (!e.hadRecentInput) cls += e.value; });
+    }).observe({type: 'layout-shift', buffered: true});
+} catch (e) {}
+setTimeout(function () {
+    result.lcp_ms = lcp || null;
+    result.cls = cls;
+    done(result);
+}, 50);
+"""
+
+BUDGET_METRICS = ("ttfb_ms", "dom_content_loaded_ms", "load_ms", "document_bytes", "fp_ms", "fcp_ms",
+                  "resource_count", "resource_bytes", "lcp_ms", "cls")
+
+
+class PerfMetricsCollector:
+
+    def __init__(self, history_path=None, window=5):
+        self.history_path = history_path or os.environ.get("PERF_HISTORY_FILE", "perf_history.jsonl")
+        self.window = window
+        self._history = None
+        self._lock = threading.Lock()
+
+    def collect(self, driver):
+        raw = driver.execute_async_script(COLLECT_METRICS_SCRIPT)
+        url = raw.pop('url')
+        metrics = {}
+        for name, value in raw.items():
+            if value is None:
+                continue
+            metrics[name] = round(value, 4) if name == "cls" else round(value)
+        return url, metrics
+
+    def baseline(self, test_name, url):
+        entries = self._load_history().get((test_name, self.page_key(url)), [])
+        baseline = {}
+        for name in {name for entry in entries for name in entry}:
+            values = [entry[name] for entry in entries if name in entry]
+            baseline[name] = statistics.median(values)
+        return baseline
+
+    def record(self, run_id, test_name, url, metrics):
+        line = json.dumps({'run': run_id, 'test': test_name, 'page': self.page_key(url), 'metrics': metrics})
+        with self._lock, open(self.history_path, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+    @staticmethod
+    def page_key(url):
+        parts = urlsplit(url)
+        return parts.path or "/"
+
+    @staticmethod
+    def unknown_budget_metrics(budget):
+        return sorted(name for name in budget if name not in BUDGET_METRICS)
+
+    @staticmethod
+    def check_budget(pages, budget):
+        violations = []
+        for name, limit in budget.items():
+            measured = [(url, metrics[name]) for url, metrics in pages if metrics.get(name) is not None]
+            if not measured:
+                violations.append(f"{name} was not collected on any page")
+            for url, value in measured:
+                if value > limit:
+                    violations.append(f"{name}={value} exceeds budget {limit} on {url}")
+        return violations
+
+    def _load_history(self):
+        with self._lock:
+            if self._history is None:
+                self._history = self._read_history()
+        return self._history
+
+    def _read_history(self):
+        history = {}
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    runs = history.setdefault((entry['test'], entry['page']), [])
+                    runs.append(entry['metrics'])
+                    del runs[:-self.window]
+        except OSError:
+            pass
+        return history
@@ -0,0 +1,51 @@
+import os
+
+
+class RerunPolicy:
+
+    def __init__(self, reruns=None, backoff=None, max_backoff=None, max_requeues=None):
+        self.reruns = reruns if reruns is not None else int(os.environ.get("TEST_RERUNS", "0"))
+        self.backoff = backoff if backoff is not None else float(os.environ.get("TEST_RERUN_BACKOFF", "1"))
+        self.max_backoff = max_backoff if max_backoff is not None else float(
+            os.environ.get("TEST_RERUN_MAX_BACKOFF", "30"))
+        self.max_requeues = max_requeues if max_requeues is not None else int(
+            os.environ.get("NODE_REQUEUE_LIMIT", "3"))
+
+    @property
+    def attempts(self):
+        return self.reruns + 1
+
+    def delay(self, attempt):
+        return min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+
+    def will_rerun(self, item):
+        if getattr(item, "attempt", 1) >= self.attempts:
+            return False
+        for when in ("setup", "call"):
+            report = getattr(item, "rep_" + when, None)
+            if report is not None and report.failed and not hasattr(report, "wasxfail"):
+                return True
+        return False
+
+    def will_requeue(self, item):
+        return getattr(item, "node_lost", False) and getattr(item, "requeues", 0) < self.max_requeues
+
+    @staticmethod
+    def requeue(item):
+        item.requeues = getattr(item, "requeues", 0) + 1
+
+    @staticmethod
+    def start_attempt(item, attempt):
+        item.attempt = attempt
+        item.node_lost = False
+        for when in ("setup", "call", "teardown"):
+            setattr(item, "rep_" + when, None)
+
+    @staticmethod
+    def mark_rerun(reports):
+        logged = []
+        for report in reports:
+            if report.failed:
+                report.outcome = "rerun"
+                logged.append(report)
+        return logged
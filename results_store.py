@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+import sqlite3
+import statistics
+import subprocess
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    error_signature TEXT,
+    error_message TEXT,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_nodeid ON results (nodeid, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+"""
+
+
+def error_signature(message):
+    if not message:
+        return None
+    normalized = re.sub(r"0x[0-9a-fA-F]+|\d+", "N", message.strip().splitlines()[0])[:300]
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+class ResultsStore:
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("TEST_RESULTS_DB", ".test_results.db")
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record_run(self, run_id, results):
+        now = time.time()
+        rows = [
+            (run_id, nodeid, result['outcome'], result['duration'],
+             error_signature(result.get('error')), (result.get('error') or "")[:1000] or None, now)
+            for nodeid, result in results.items()
+        ]
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO runs (run_id, started_at) VALUES (?, ?)", (run_id, now))
+            self.connection.executemany(
+                "INSERT INTO results (run_id, nodeid, outcome, duration, error_signature, error_message, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def history(self, nodeid, limit=20):
+        cursor = self.connection.execute(
+            "SELECT outcome, duration, error_signature FROM results WHERE nodeid = ? "
+            "ORDER BY recorded_at DESC, rowid DESC LIMIT ?", (nodeid, limit)
+        )
+        return cursor.fetchall()
+
+    def recent_failures(self, runs=3):
+        cursor = self.connection.execute(
+            "SELECT DISTINCT nodeid FROM results WHERE outcome = 'failed' AND run_id IN "
+            "(SELECT run_id FROM runs ORDER BY started_at DESC LIMIT ?)", (runs,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def last_failed(self):
+        cursor = self.connection.execute(
+            "SELECT nodeid, outcome FROM results WHERE outcome IN ('passed', 'failed') ORDER BY recorded_at, rowid"
+        )
+        latest = dict(cursor.fetchall())
+        return sorted(nodeid for nodeid, outcome in latest.items() if outcome == 'failed')
+
+    def flakiness(self, window=20, min_runs=4):
+        cursor = self.connection.execute(
+            "SELECT nodeid, outcome FROM results WHERE outcome IN ('passed', 'failed') ORDER BY nodeid, recorded_at, rowid"
+        )
+        outcomes = {}
+        for nodeid, outcome in cursor.fetchall():
+            outcomes.setdefault(nodeid, []).append(outcome)
+
+        scores = {}
+        for nodeid, history in outcomes.items():
+            history = history[-window:]
+            if len(history) < min_runs:
+                continue
+            flips = sum(1 for previous, current in zip(history, history[1:]) if previous != current)
+            failures = history.count('failed')
+            if flips and failures:
+                scores[nodeid] = (round(flips / (len(history) - 1), 2), failures, len(history))
+        return scores
+
+    def duration_regressions(self, run_id, threshold=1.5, min_seconds=0.5, baseline_runs=10):
+        cursor = self.connection.execute(
+            "SELECT nodeid, duration FROM results WHERE run_id = ? AND outcome = 'passed'", (run_id,)
+        )
+        regressions = []
+        for nodeid, duration in cursor.fetchall():
+            previous = self.connection.execute(
+                "SELECT duration FROM results WHERE nodeid = ? AND run_id != ? AND outcome = 'passed' "
+                "ORDER BY recorded_at DESC, rowid DESC LIMIT ?", (nodeid, run_id, baseline_runs)
+            ).fetchall()
+            if not previous:
+                continue
+            baseline = statistics.median(row[0] for row in previous)
+            if duration >= min_seconds and baseline > 0 and duration / baseline >= threshold:
+                regressions.append((nodeid, baseline, duration, duration / baseline))
+        return sorted(regressions, key=lambda r: r[3], reverse=True)
+
+    def report_sections(self, run_id, limit=20):
+        sections = []
+        regressions = self.duration_regressions(run_id)
+        if regressions:
+            sections.append((
+                "Duration regressions",
+                ["Test", "Baseline (s)", "This run (s)", "Slowdown"],
+                [[nodeid, f"{baseline:.2f}", f"{duration:.2f}", f"{ratio:.1f}x"]
+                 for nodeid, baseline, duration, ratio in regressions[:limit]]
+            ))
+        flaky = sorted(self.flakiness().items(), key=lambda item: item[1][0], reverse=True)
+        if flaky:
+            sections.append((
+                "Flaky tests",
+                ["Test", "Flip rate", "Failures", "Runs"],
+                [[nodeid, f"{score:.2f}", str(failures), str(runs)]
+                 for nodeid, (score, failures, runs) in flaky[:limit]]
+            ))
+        return sections
+
+
+def changed_test_files():
+    commands = (["git", "diff", "--name-only", "HEAD"],
+                ["git", "diff", "--name-only", "HEAD~1", "HEAD"],
+                ["git", "ls-files", "--others", "--exclude-standard"])
+    changed = set()
+    for cmd in commands:
+        try:
+            output = subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        changed.update(line.strip() for line in output.splitlines() if line.strip().endswith(".py"))
+    return changed
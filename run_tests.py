@@ -1,9 +1,37 @@
+import argparse
 import subprocess
 import sys
 import os
 from datetime import datetime
+from parallel_runner import ParallelRunner
+from results_store import ResultsStore
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Selenium test runner")
+    parser.add_argument("-m", dest="marker", help="Run only tests with this marker")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of parallel worker processes (each with its own browser)")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="Browsers driven concurrently by each test process (one thread per browser)")
+    parser.add_argument("--nodes",
+                        help="Comma-separated Selenium node URLs, each optionally followed by =MAX_SESSIONS")
+    parser.add_argument("--scenarios", help="CSV or JSONL file of search scenarios to run against one browser")
+    parser.add_argument("--failed-first", action="store_true",
+                        help="Run recently failed tests, then tests in recently changed files, before the rest")
+    parser.add_argument("--last-failed", action="store_true",
+                        help="Run only the tests whose last recorded result was a failure")
+    parser.add_argument("--reruns", type=int, default=0,
+                        help="Retry a failed test up to this many times in a warm browser")
+    parser.add_argument("--rerun-backoff", type=float, default=1.0,
+                        help="Seconds to wait before the first retry; doubles on every further retry")
+    args = parser.parse_args()
+    if args.nodes and args.workers > 1:
+        parser.error("--nodes dispatches tests from a single process; use it without --workers")
+    return args
 
 def run_tests():
+    args = parse_args()
+
     print("=" * 80)
     print("SELENIUM TEST AUTOMATION FRAMEWORK")
     print("=" * 80)
@@ -14,20 +42,56 @@ def run_tests():
     os.makedirs("logs", exist_ok=True)
     
     cmd = ["pytest", "test_amazon.py", "-v", "-s"]
+    nodeids = None
     
-    if len(sys.argv) > 1 and sys.argv[1] == "-m":
-        cmd.extend(["-m", sys.argv[2]])
-        print(f"Running tests with marker: {sys.argv[2]}")
+    if args.last_failed:
+        store = ResultsStore()
+        try:
+            nodeids = [nodeid for nodeid in store.last_failed() if os.path.exists(nodeid.split("::")[0])]
+        finally:
+            store.close()
+        if not nodeids:
+            print("No failed tests recorded in the previous run")
+            return 0
+        cmd = ["pytest", *nodeids, "-v", "-s"]
+        print(f"Re-running {len(nodeids)} tests that failed last time")
+    elif args.scenarios:
+        os.environ["SEARCH_SCENARIOS"] = os.path.abspath(args.scenarios)
+        cmd.extend(["-m", "scenarios"])
+        print(f"Running search scenarios from: {args.scenarios}")
+    elif args.marker:
+        cmd.extend(["-m", args.marker])
+        print(f"Running tests with marker: {args.marker}")
     else:
         print("Running all tests")
     
+    if args.nodes:
+        os.environ["SELENIUM_NODES"] = args.nodes
+        print(f"Selenium nodes: {args.nodes}")
+    
+    if args.threads > 1:
+        os.environ["TEST_THREADS"] = str(args.threads)
+        print(f"Threaded mode: {args.threads} browsers per process")
+    
+    if args.failed_first:
+        os.environ["TEST_ORDER"] = "failed-first"
+        print("Ordering: recently failed and recently changed tests first")
+    
+    if args.reruns > 0:
+        os.environ["TEST_RERUNS"] = str(args.reruns)
+        os.environ["TEST_RERUN_BACKOFF"] = str(args.rerun_backoff)
+        print(f"Reruns: up to {args.reruns} retries per failed test, backoff from {args.rerun_backoff}s")
+    
     print()
     print("=" * 80)
     print("EXECUTING TESTS...")
     print("=" * 80)
     print()
     
-    result = subprocess.run(cmd)
+    if args.workers > 1:
+        returncode = ParallelRunner(args.workers, marker="scenarios" if args.scenarios else args.marker).run(nodeids)
+    else:
+        returncode = subprocess.run(cmd).returncode
     
     print()
     print("=" * 80)
@@ -40,7 +104,7 @@ def run_tests():
     print("  - Logs: logs/")
     print()
     
-    return result.returncode
+    return returncode
 
 if __name__ == "__main__":
     exit_code = run_tests()
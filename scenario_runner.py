@@ -0,0 +1,155 @@
+import csv
+import json
+import logging
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from driver_profiler import DriverProfiler
+import pages
+from smart_wait import SmartWait
+
+logger = logging.getLogger("TestAutomation")
+
+
+def iter_scenarios(path):
+    if path.endswith(".jsonl"):
+        with open(path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield InvalidScenario(f"line {number}", f"invalid JSON: {e}")
+    else:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+
+
+class InvalidScenario:
+
+    __slots__ = ('scenario_id', 'error')
+
+    def __init__(self, scenario_id, error):
+        self.scenario_id = scenario_id
+        self.error = error
+
+
+class ScenarioResult:
+
+    __slots__ = ('scenario_id', 'query', 'passed', 'count', 'mentions', 'elapsed', 'error')
+
+    def __init__(self, scenario_id, query):
+        self.scenario_id = scenario_id
+        self.query = query
+        self.passed = False
+        self.count = 0
+        self.mentions = 0
+        self.elapsed = 0.0
+        self.error = None
+
+
+class SearchScenarioRunner:
+
+    def __init__(self, driver, base_url, extent_report, timeout=None, max_failures_listed=20):
+        self.driver = driver
+        self.base_url = base_url
+        self.extent_report = extent_report
+        self.timeout = timeout or float(os.environ.get("SCENARIO_TIMEOUT", "10"))
+        self.max_failures_listed = max_failures_listed
+        self.page = pages.AmazonSearchResultsPage(driver, base_url=base_url)
+        self.total = 0
+        self.passed = 0
+        self.failures = []
+
+    def run(self, scenarios):
+        profiler = DriverProfiler.attach(self.driver)
+        previous_callback = profiler.on_command
+        start = time.perf_counter()
+        try:
+            for scenario in scenarios:
+                result = self.run_scenario(scenario, profiler)
+                self.total += 1
+                if result.passed:
+                    self.passed += 1
+                elif len(self.failures) < self.max_failures_listed:
+                    self.failures.append(f"{result.scenario_id}: {result.error}")
+                if self.total % 100 == 0:
+                    logger.info(f"Scenarios: {self.total} run, {self.total - self.passed} failed, "
+                                f"{self.total / (time.perf_counter() - start):.1f}/s")
+        finally:
+            profiler.on_command = previous_callback
+        return self
+
+    def run_scenario(self, scenario, profiler):
+        try:
+            scenario_id, query, expect_text, min_results = self.parse(scenario)
+        except ValueError as e:
+            return self._invalid(scenario, e)
+        result = ScenarioResult(scenario_id, query)
+
+        test_info = self.extent_report.start_test(f"search[{result.scenario_id}]", f"Search scenario: {query}",
+                                                  markers=["scenario"])
+        profiler.on_command = lambda command, started, duration: self.extent_report.add_timing(
+            test_info, "command", command, started, duration)
+        wait = SmartWait(self.driver, timeout=self.timeout, on_wait=lambda record: self.extent_report.add_timing(
+            test_info, "wait", record.name, time.perf_counter() - record.elapsed, record.elapsed))
+
+        start = time.perf_counter()
+        try:
+            self.page.open_query(query)
+            summary = wait.until(lambda driver: self._settled(expect_text), name="search results")
+            result.count = summary['count']
+            result.mentions = summary['mentions']
+            if result.count < min_results:
+                result.error = f"expected at least {min_results} results, got {result.count}"
+            elif not result.mentions:
+                result.error = f"'{expect_text}' not found in {result.count} results"
+            else:
+                result.passed = True
+        except (TimeoutException, WebDriverException) as e:
+            result.error = f"{type(e).__name__}: {getattr(e, 'msg', None) or e}"
+        result.elapsed = time.perf_counter() - start
+
+        self.extent_report.log(test_info, "INFO", f"Query: {query}")
+        self.extent_report.log(test_info, "PASS" if result.passed else "ERROR",
+                               f"{result.count} results, {result.mentions} mention '{expect_text}' "
+                               f"({result.elapsed * 1000:.0f}ms)")
+        self.extent_report.end_test(test_info, "PASS" if result.passed else "FAIL", result.error)
+        return result
+
+    @staticmethod
+    def parse(scenario):
+        if isinstance(scenario, InvalidScenario):
+            raise ValueError(scenario.error)
+        if not isinstance(scenario, dict):
+            raise ValueError(f"expected an object, got {type(scenario).__name__}")
+        query = str(scenario.get('query') or "").strip()
+        if not query:
+            raise ValueError("missing query")
+        expect_text = str(scenario.get('expect_text') or query).strip()
+        try:
+            min_results = int(scenario.get('min_results') or 1)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid min_results {scenario.get('min_results')!r}") from None
+        return str(scenario.get('id') or query), query, expect_text, min_results
+
+    def _invalid(self, scenario, error):
+        if isinstance(scenario, InvalidScenario):
+            scenario_id = scenario.scenario_id
+        else:
+            known = scenario.get('id') or scenario.get('query') if isinstance(scenario, dict) else None
+            scenario_id = str(known or f"#{self.total + 1}")
+        result = ScenarioResult(scenario_id, None)
+        result.error = f"invalid scenario: {error}"
+        test_info = self.extent_report.start_test(f"search[{scenario_id}]", "Invalid search scenario",
+                                                  markers=["scenario"])
+        self.extent_report.end_test(test_info, "FAIL", result.error)
+        logger.warning(f"Scenario {scenario_id}: {result.error}")
+        return result
+
+    def _settled(self, expect_text):
+        summary = self.page.summary(expect_text)
+        return summary if summary['count'] or summary['ready'] else None
@@ -0,0 +1,74 @@
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("TestAutomation")
+
+
+class ScreenshotPipeline:
+
+    EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp', 'png': 'png'}
+
+    def __init__(self, screenshot_dir="screenshots", image_format=None, quality=None, max_width=None):
+        self.screenshot_dir = screenshot_dir
+        self.image_format = (image_format or os.environ.get("SCREENSHOT_FORMAT", "jpeg")).lower()
+        self.quality = quality or int(os.environ.get("SCREENSHOT_QUALITY", "70"))
+        self.max_width = max_width or int(os.environ.get("SCREENSHOT_MAX_WIDTH", "1280"))
+        if self.image_format != "png" and importlib.util.find_spec("PIL") is None:
+            logger.warning("Pillow is not installed; screenshots will be stored as uncompressed PNG")
+            self.image_format = "png"
+
+        self._known = set()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def capture(self, driver, name_hint=""):
+        png_bytes = driver.get_screenshot_as_png()
+        digest = hashlib.sha256(png_bytes).hexdigest()[:16]
+        filename = f"{digest}.{self.EXTENSIONS.get(self.image_format, 'png')}"
+        path = os.path.join(self.screenshot_dir, filename)
+
+        with self._lock:
+            duplicate = digest in self._known or os.path.exists(path)
+            self._known.add(digest)
+            if not duplicate:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+                self._executor.submit(self._encode_and_write, png_bytes, path, name_hint)
+
+        if duplicate:
+            logger.info(f"Screenshot identical to existing capture, reusing: {path}")
+        return path
+
+    def _encode_and_write(self, png_bytes, path, name_hint):
+        try:
+            data = png_bytes
+            if self.image_format != "png":
+                from PIL import Image
+
+                image = Image.open(io.BytesIO(png_bytes))
+                if image.width > self.max_width:
+                    height = round(image.height * self.max_width / image.width)
+                    image = image.resize((self.max_width, height))
+                buffer = io.BytesIO()
+                image.convert("RGB").save(buffer, format=self.image_format.upper(), quality=self.quality)
+                data = buffer.getvalue()
+
+            os.makedirs(self.screenshot_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            logger.debug(f"Screenshot written for {name_hint}: {path} ({len(png_bytes)} -> {len(data)} bytes)")
+        except Exception as e:
+            logger.error(f"Failed to write screenshot {path}: {e}")
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
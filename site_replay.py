@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+logger = logging.getLogger("TestAutomation")
+
+FORWARDED_HEADERS = ("content-type", "cache-control", "location", "set-cookie")
+REWRITTEN_TYPES = ("text/", "application/javascript", "application/json")
+# tracking parameters that change on every visit and would make replay lookups miss
+VOLATILE_PARAMS = ("crid", "qid", "sprefix", "ref", "ref_", "pd_rd_r", "pd_rd_w", "pd_rd_wg",
+                   "pf_rd_p", "pf_rd_r", "dib", "dib_tag")
+# namespace URIs are identifiers, not resources; rewriting them breaks SVG and XML documents
+UNPROXIED_HOSTS = (b"www.w3.org",)
+HOST = rb"[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+(?::\d+)?"
+ABSOLUTE_URL = re.compile(rb"(https?):(\\?/)\\?/(" + HOST + rb")")
+PROTOCOL_RELATIVE_URL = re.compile(rb"(?<=[\"'(])//(" + HOST + rb")(?=[/\"')])")
+ORIGIN_PREFIX = "/__site/"
+
+
+class SiteReplayServer:
+
+    def __init__(self, upstream, mode="replay", snapshot_dir="snapshots", latency_ms=0, host="127.0.0.1", port=0,
+                 volatile_params=None):
+        self.upstream = upstream.rstrip("/")
+        self.volatile_params = set(VOLATILE_PARAMS if volatile_params is None else volatile_params)
+        self.mode = mode
+        self.snapshot_dir = snapshot_dir
+        self.latency_ms = latency_ms
+        self.host = host
+        self.port = port
+        self.hits = 0
+        self.misses = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def start(self):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="site-replay", daemon=True)
+        self._thread.start()
+        logger.info(f"Site {self.mode} server for {self.upstream} listening on {self.url}")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            logger.info(f"Site {self.mode} server stopped ({self.hits} served, {self.misses} missing)")
+
+    def chrome_arguments(self):
+        if self.mode != "replay":
+            return []
+        # every page resource is rewritten to this server; anything else fails instead of going live
+        return [f"--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE {self.host}"]
+
+    def snapshot_key(self, method, path, body=b"", origin=None):
+        parts = urlsplit(path)
+        # Amazon also puts ref= tags in the path: /s/ref=nb_sb_noss?k=laptop
+        request_path = re.sub(r"/ref=[^/]*", "", parts.path) or "/"
+        params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                  if name not in self.volatile_params]
+        query = urlencode(sorted(params))
+        prefix = origin if origin and origin != self.upstream else ""
+        raw = f"{method} {prefix}{request_path}?{query}".encode() + hashlib.sha1(body).digest()
+        return hashlib.sha1(raw).hexdigest()
+
+    def route(self, path):
+        if not path.startswith(ORIGIN_PREFIX):
+            return self.upstream, path
+        scheme, _, rest = path[len(ORIGIN_PREFIX):].partition("/")
+        host, _, rest = rest.partition("/")
+        return f"{scheme}://{host}", "/" + rest
+
+    def load(self, key):
+        meta_path = os.path.join(self.snapshot_dir, f"{key}.json")
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(os.path.join(self.snapshot_dir, f"{key}.body"), 'rb') as f:
+                return meta, f.read()
+        except OSError:
+            return None, None
+
+    def save(self, key, meta, body):
+        with open(os.path.join(self.snapshot_dir, f"{key}.body"), 'wb') as f:
+            f.write(body)
+        tmp_path = os.path.join(self.snapshot_dir, f"{key}.json.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.snapshot_dir, f"{key}.json"))
+
+    def fetch(self, method, path, body, headers, origin=None):
+        request = urllib.request.Request(
+            (origin or self.upstream) + path,
+            data=body or None,
+            method=method,
+            headers={
+                'User-Agent': headers.get('User-Agent', "Mozilla/5.0"),
+                'Accept': headers.get('Accept', "*/*"),
+                'Accept-Language': headers.get('Accept-Language', "en-US,en;q=0.9"),
+                'Accept-Encoding': "identity",
+            }
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                status, response_headers, content = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, response_headers, content = e.code, e.headers, e.read()
+
+        meta = {
+            'url': (origin or self.upstream) + path,
+            'status': status,
+            'headers': {name: value for name, value in response_headers.items() if name.lower() in FORWARDED_HEADERS},
+            'recorded_at': time.time(),
+        }
+        return meta, content
+
+    def rewrite(self, meta, body):
+        content_type = next((value for name, value in meta['headers'].items() if name.lower() == "content-type"), "")
+        if not content_type.startswith(REWRITTEN_TYPES):
+            return body
+        return self.rewrite_urls(body)
+
+    def rewrite_urls(self, content):
+        # absolute URLs of any host (also JSON-escaped as https:\/\/host) and protocol-relative //host
+        # URLs point back at this server, so CDN and third-party assets are recorded and replayed too
+        content = ABSOLUTE_URL.sub(lambda m: self._local_url(m.group(1), m.group(3), m.group(2), m.group(0)), content)
+        return PROTOCOL_RELATIVE_URL.sub(lambda m: self._local_url(b"https", m.group(1), b"/", m.group(0)), content)
+
+    def _local_url(self, scheme, host, slash, original):
+        if host.lower() in UNPROXIED_HOSTS:
+            return original
+        local = f"http://{self.host}:{self._server.server_address[1]}".encode().replace(b"/", slash)
+        if f"{scheme.decode()}://{host.decode()}".lower() == self.upstream.lower():
+            return local
+        return local + slash.join([ORIGIN_PREFIX.rstrip("/").encode().replace(b"/", slash), scheme, host])
+
+    def _handler_class(self):
+        server = self
+
+        class SnapshotHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                self._serve(b"")
+
+            def do_HEAD(self):
+                self._serve(b"", send_body=False)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self._serve(self.rfile.read(length))
+
+            def _serve(self, request_body, send_body=True):
+                origin, path = server.route(self.path)
+                key = server.snapshot_key(self.command, path, request_body, origin)
+                meta, body = server.load(key)
+
+                if meta is None and server.mode == "record":
+                    try:
+                        meta, body = server.fetch(self.command, path, request_body, self.headers, origin)
+                        server.save(key, meta, body)
+                    except Exception as e:
+                        logger.warning(f"Recording {self.path} failed: {e}")
+
+                if meta is None:
+                    server.misses += 1
+                    self.send_error(404, f"No snapshot recorded for {self.path}")
+                    return
+
+                server.hits += 1
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+
+                body = server.rewrite(meta, body)
+                self.send_response(meta['status'])
+                for name, value in meta['headers'].items():
+                    if name.lower() == "location":
+                        value = server.rewrite_urls(value.encode()).decode()
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"[site {server.mode}] {self.address_string()} {format % args}")
+
+        return SnapshotHandler
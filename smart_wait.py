@@ -0,0 +1,165 @@
+import logging
+import time
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+logger = logging.getLogger("TestAutomation")
+
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+DOM_OBSERVER_SCRIPT = """
+if (!window.__smartWaitObserver) {
+    window.__smartWaitLastMutation = performance.now();
+    window.__smartWaitObserver = new MutationObserver(function () {
+        window.__smartWaitLastMutation = performance.now();
+    });
+    window.__smartWaitObserver.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return document.readyState === 'complete' && performance.now() - window.__smartWaitLastMutation >= arguments[0];
+"""
+
+# fetch/XHR are wrapped on the first poll so in-flight requests count as activity; a resource observer
+# and a larger timing buffer keep late resources visible on pages that load more than 250 of them
+NETWORK_IDLE_SCRIPT = """
+var state = window.__smartWaitNetwork;
+if (!state) {
+    state = window.__smartWaitNetwork = {pending: 0, lastActivity: 0};
+    var touch = function () { state.lastActivity = performance.now(); };
+    var done = function () { state.pending--; touch(); };
+    if (performance.setResourceTimingBufferSize) performance.setResourceTimingBufferSize(10000);
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (e) { state.lastActivity = Math.max(state.lastActivity, e.responseEnd); });
+        }).observe({type: 'resource', buffered: true});
+    } catch (e) {}
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            touch();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { done(); return response; },
+                function (error) { done(); throw error; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        touch();
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+}
+if (document.readyState !== 'complete' || state.pending > 0) return false;
+var entries = performance.getEntriesByType('resource');
+var lastEnd = state.lastActivity;
+for (var i = 0; i < entries.length; i++) {
+    if (entries[i].responseEnd === 0) return false;
+    lastEnd = Math.max(lastEnd, entries[i].responseEnd);
+}
+return performance.now() - lastEnd >= arguments[0];
+"""
+
+
+class WaitRecord:
+
+    def __init__(self, name, elapsed, polls, success):
+        self.name = name
+        self.elapsed = elapsed
+        self.polls = polls
+        self.success = success
+
+
+class SmartWait:
+
+    def __init__(self, driver, timeout=15, initial_poll=0.05, max_poll=0.5, backoff=1.5, on_wait=None):
+        self.driver = driver
+        self.timeout = timeout
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.on_wait = on_wait
+        self.records = []
+
+    def until(self, condition, message="", timeout=None, name=None):
+        name = name or getattr(condition, "__name__", None) or type(condition).__name__
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+        interval = self.initial_poll
+        polls = 0
+
+        while True:
+            polls += 1
+            try:
+                value = condition(self.driver)
+                if value:
+                    self._record(name, time.perf_counter() - start, polls, True)
+                    return value
+            except IGNORED_EXCEPTIONS:
+                pass
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self._record(name, time.perf_counter() - start, polls, False)
+                raise TimeoutException(message or f"Timed out after {timeout}s waiting for {name}")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.max_poll)
+
+    def until_dom_quiet(self, quiet_ms=300, timeout=None):
+        return self.until(dom_quiescent(quiet_ms), timeout=timeout, name=f"dom quiet {quiet_ms}ms")
+
+    def until_network_idle(self, idle_ms=500, timeout=None):
+        return self.until(network_idle(idle_ms), timeout=timeout, name=f"network idle {idle_ms}ms")
+
+    @property
+    def total_time(self):
+        return sum(record.elapsed for record in self.records)
+
+    def _record(self, name, elapsed, polls, success):
+        record = WaitRecord(name, elapsed, polls, success)
+        self.records.append(record)
+        logger.debug(f"Wait '{name}' {'done' if success else 'timed out'} in {elapsed * 1000:.0f}ms ({polls} polls)")
+        if self.on_wait is not None:
+            self.on_wait(record)
+
+
+def any_of(*conditions):
+    def _any_of(driver):
+        for condition in conditions:
+            try:
+                value = condition(driver)
+                if value:
+                    return value
+            except IGNORED_EXCEPTIONS:
+                pass
+        return False
+    return _any_of
+
+
+def all_of(*conditions):
+    def _all_of(driver):
+        values = []
+        for condition in conditions:
+            value = condition(driver)
+            if not value:
+                return False
+            values.append(value)
+        return values
+    return _all_of
+
+
+def dom_quiescent(quiet_ms=300):
+    def _dom_quiescent(driver):
+        return driver.execute_script(DOM_OBSERVER_SCRIPT, quiet_ms)
+    return _dom_quiescent
+
+
+def network_idle(idle_ms=500):
+    def _network_idle(driver):
+        return driver.execute_script(NETWORK_IDLE_SCRIPT, idle_ms)
+    return _network_idle
@@ -1,18 +1,19 @@
+import os
+import logging
 import pytest
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from log_config import LogConfig
-import time
+import pages
+from scenario_runner import SearchScenarioRunner, iter_scenarios
+from smart_wait import all_of, dom_quiescent, network_idle
 
-logger = LogConfig.setup_logger()
+logger = logging.getLogger("TestAutomation")
 
 @pytest.mark.usefixtures("setup_class", "setup_method")
 class TestAmazonWebsite:
     #тест нг
     @pytest.mark.smoke
     @pytest.mark.priority(1)
+    @pytest.mark.browser_profile("functional-fast")
     def test_amazon_homepage_loads(self):
         #смоук тест
         test_info = self.test_info
@@ -20,19 +21,20 @@ class TestAmazonWebsite:
         self.extent_report.log(test_info, "INFO", "Navigating to Amazon homepage")
         
         try:
-            logger.info("Navigating to https://www.amazon.com")
-            self.driver.get("https://www.amazon.com")
-            self.extent_report.log(test_info, "INFO", "URL loaded: https://www.amazon.com")
+            logger.info(f"Navigating to {self.base_url}")
+            with self.extent_report.step(test_info, "Open homepage"):
+                home_page = pages.AmazonHomePage(self.driver, self.wait, self.base_url).open()
+            self.extent_report.log(test_info, "INFO", f"URL loaded: {self.base_url}")
             
-            wait = WebDriverWait(self.driver, 15)
-            wait.until(EC.presence_of_element_located((By.ID, "nav-logo-sprites")))
+            with self.extent_report.step(test_info, "Wait for logo"):
+                home_page.wait_for('logo')
             
-            logger.info(f"Page title: {self.driver.title}")
-            assert "Amazon" in self.driver.title, "Amazon not in title"
-            self.extent_report.log(test_info, "PASS", f"Page title verified: {self.driver.title}")
+            title = self.driver.title
+            logger.info(f"Page title: {title}")
+            assert "Amazon" in title, "Amazon not in title"
+            self.extent_report.log(test_info, "PASS", f"Page title verified: {title}")
             
-            logo = self.driver.find_element(By.ID, "nav-logo-sprites")
-            assert logo.is_displayed(), "Amazon logo not displayed"
+            assert home_page.describe('logo')['logo']['displayed'], "Amazon logo not displayed"
             logger.info("Amazon logo is displayed")
             self.extent_report.log(test_info, "PASS", "Amazon logo is visible")
             
@@ -59,36 +61,31 @@ class TestAmazonWebsite:
         self.extent_report.log(test_info, "INFO", "Testing search functionality")
         
         try:
-            logger.info("Navigating to https://www.amazon.com")
-            self.driver.get("https://www.amazon.com")
+            logger.info(f"Navigating to {self.base_url}")
+            with self.extent_report.step(test_info, "Open homepage"):
+                home_page = pages.AmazonHomePage(self.driver, self.wait, self.base_url).open()
             self.extent_report.log(test_info, "INFO", "Navigated to Amazon")
             
-            wait = WebDriverWait(self.driver, 15)
-            search_box = wait.until(EC.presence_of_element_located((By.ID, "twotabsearchtextbox")))
+            home_page.wait_for('search_box', 'search_button')
             logger.info("Search box found")
             self.extent_report.log(test_info, "INFO", "Search box located")
             
             search_query = "laptop"
-            search_box.clear()
-            search_box.send_keys(search_query)
+            with self.extent_report.step(test_info, "Submit search"):
+                results_page = home_page.search(search_query)
             logger.info(f"Entered search query: {search_query}")
             self.extent_report.log(test_info, "INFO", f"Search query entered: {search_query}")
-            
-            search_button = self.driver.find_element(By.ID, "nav-search-submit-button")
-            search_button.click()
             logger.info("Search button clicked")
             self.extent_report.log(test_info, "INFO", "Search submitted")
             
-            time.sleep(2)
-            results = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-component-type='s-search-result']")))
-            
-            all_results = self.driver.find_elements(By.CSS_SELECTOR, "[data-component-type='s-search-result']")
+            with self.extent_report.step(test_info, "Wait for results"):
+                all_results = results_page.results()
             assert len(all_results) > 0, "No search results found"
             logger.info(f"Found {len(all_results)} search results")
             self.extent_report.log(test_info, "PASS", f"Search returned {len(all_results)} results")
             
-            assert search_query.lower() in self.driver.page_source.lower()
-            logger.info("Search term found in page source")
+            assert results_page.results_mention(search_query), "Search term not found in results"
+            logger.info("Search term found in results")
             self.extent_report.log(test_info, "PASS", "Search term verified in results")
             
             logger.info("TEST PASSED: test_search_functionality")
@@ -102,6 +99,7 @@ class TestAmazonWebsite:
     
     @pytest.mark.regression
     @pytest.mark.priority(3)
+    @pytest.mark.perf_budget(lcp_ms=4000, cls=0.25)
     def test_navigation_menu(self):
         #регрешн тест
         test_info = self.test_info
@@ -109,16 +107,15 @@ class TestAmazonWebsite:
         self.extent_report.log(test_info, "INFO", "Testing navigation menu")
         
         try:
-            self.driver.get("https://www.amazon.com")
+            with self.extent_report.step(test_info, "Open homepage"):
+                home_page = pages.AmazonHomePage(self.driver, self.wait, self.base_url).open()
             self.extent_report.log(test_info, "INFO", "Navigated to Amazon")
             
-            wait = WebDriverWait(self.driver, 15)
-            nav_bar = wait.until(EC.presence_of_element_located((By.ID, "nav-main")))
+            home_page.wait_for('nav_main', 'menu_button')
             logger.info("Navigation bar found")
             self.extent_report.log(test_info, "INFO", "Navigation bar located")
             
-            menu_button = self.driver.find_element(By.ID, "nav-hamburger-menu")
-            assert menu_button.is_displayed(), "Menu button not displayed"
+            assert home_page.describe('menu_button')['menu_button']['displayed'], "Menu button not displayed"
             logger.info("Menu button is visible")
             self.extent_report.log(test_info, "PASS", "Menu button is visible and accessible")
             
@@ -140,12 +137,12 @@ class TestAmazonWebsite:
         self.extent_report.log(test_info, "WARNING", "This test will intentionally fail")
         
         try:
-            self.driver.get("https://www.amazon.com")
+            with self.extent_report.step(test_info, "Open homepage"):
+                home_page = pages.AmazonHomePage(self.driver, self.wait, self.base_url).open()
             self.extent_report.log(test_info, "INFO", "Navigated to Amazon")
 
-            wait = WebDriverWait(self.driver, 15)
-            wait.until(EC.presence_of_element_located((By.ID, "nav-logo-sprites")))
-            time.sleep(2)
+            self.wait.until(all_of(home_page.present('logo'), dom_quiescent(), network_idle()),
+                            name="page fully loaded")
             logger.info("Page fully loaded")
             self.extent_report.log(test_info, "INFO", "Page fully rendered")
             #спец фейл
@@ -157,4 +154,28 @@ class TestAmazonWebsite:
             logger.error(f"TEST FAILED (Expected): {str(e)}")
             self.extent_report.log(test_info, "ERROR", "Assertion failed as expected")
             self.extent_report.end_test(test_info, "FAIL", str(e))
-            raise
\ No newline at end of file
+            raise
+    
+    @pytest.mark.scenarios
+    @pytest.mark.skipif(not os.environ.get("SEARCH_SCENARIOS"), reason="SEARCH_SCENARIOS is not set")
+    def test_search_scenarios(self):
+        #дата тест
+        test_info = self.test_info
+        scenario_file = os.environ["SEARCH_SCENARIOS"]
+        logger.info(f"TEST STARTED: test_search_scenarios ({scenario_file})")
+        self.extent_report.log(test_info, "INFO", f"Streaming search scenarios from {scenario_file}")
+        
+        with self.extent_report.step(test_info, "Run scenarios"):
+            runner = SearchScenarioRunner(self.driver, self.base_url, self.extent_report).run(
+                iter_scenarios(scenario_file)
+            )
+        failed = runner.total - runner.passed
+        logger.info(f"Scenarios finished: {runner.passed}/{runner.total} passed")
+        self.extent_report.log(test_info, "PASS" if not failed else "ERROR",
+                               f"{runner.passed}/{runner.total} scenarios passed")
+        
+        if failed:
+            message = f"{failed} of {runner.total} search scenarios failed: " + "; ".join(runner.failures)
+            self.extent_report.end_test(test_info, "FAIL", message)
+            pytest.fail(message)
+        self.extent_report.end_test(test_info, "PASS")
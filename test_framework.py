@@ -0,0 +1,497 @@
+import json
+import os
+import time
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from browser_pool import BrowserPool
+from driver_resolver import DriverResolver
+from duration_history import DurationHistory
+from extent_report import ExtentReport
+from failure_artifacts import BrowserLogBuffer
+from node_registry import parse_nodes
+from parallel_runner import ParallelRunner
+from perf_metrics import PerfMetricsCollector
+from rerun_policy import RerunPolicy
+from results_store import ResultsStore
+from scenario_runner import SearchScenarioRunner, iter_scenarios
+from screenshot_pipeline import ScreenshotPipeline
+from site_replay import SiteReplayServer
+import smart_wait
+from smart_wait import SmartWait, all_of, any_of
+
+
+class FakeDriver:
+
+    current_url = "about:blank"
+    window_handles = ["main"]
+
+    def __init__(self):
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+        self.quit_called = False
+
+    def execute_script(self, script, *args):
+        return None
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        self.quit_called = True
+
+    def execute(self, driver_command, params=None):
+        return {'value': None}
+
+    def get_screenshot_as_png(self):
+        return b"\x89PNG fake screenshot of " + self.current_url.encode()
+
+
+def finished_report(stream_dir, test_names, mode="html"):
+    report = ExtentReport("Merge_Report", stream_dir=stream_dir, mode=mode)
+    for name in test_names:
+        test_info = report.start_test(name)
+        report.end_test(test_info, "PASS")
+    return report
+
+
+class TestDurationHistory:
+
+    def test_shard_balances_known_durations(self, tmp_path):
+        history = DurationHistory(str(tmp_path / "durations.json"))
+        history.durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 2.0}
+        shards = history.shard(list(history.durations), 2)
+
+        assert sorted(sorted(shard['tests']) for shard in shards) == [["a", "d"], ["b", "c"]]
+        assert [shard['estimate'] for shard in shards] == [7.0, 7.0]
+
+    def test_unknown_tests_use_average_duration(self, tmp_path):
+        history = DurationHistory(str(tmp_path / "durations.json"))
+        assert history.estimate("new") == 1.0
+
+        history.durations = {"a": 2.0, "b": 4.0}
+        assert history.estimate("new") == 3.0
+        assert history.estimate("a") == 2.0
+
+    def test_update_smooths_and_save_roundtrips(self, tmp_path):
+        path = str(tmp_path / "durations.json")
+        history = DurationHistory(path)
+        history.update({"a": 2.0})
+        history.update({"a": 4.0})
+        history.save()
+
+        assert DurationHistory(path).load().durations == {"a": 3.0}
+
+
+class TestParallelRunner:
+
+    def test_parse_collected_keeps_ids_with_spaces(self):
+        output = ("test_amazon.py::TestAmazonWebsite::test_search_functionality\n"
+                  "test_amazon.py::TestSearch::test_query[gaming laptop]\n"
+                  "\n"
+                  "2 tests collected in 0.05s\n")
+
+        assert ParallelRunner.parse_collected(output) == [
+            "test_amazon.py::TestAmazonWebsite::test_search_functionality",
+            "test_amazon.py::TestSearch::test_query[gaming laptop]",
+        ]
+
+
+class TestExtentReportMerge:
+
+    def test_worker_reports_merge_without_losing_tests(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        for index in range(2):
+            worker_dir = tmp_path / f"gw{index}"
+            worker_dir.mkdir()
+            finished_report(str(worker_dir), [f"test_worker_{index}"]).save_results(str(worker_dir / "results.json"))
+
+        merged = ExtentReport("Merge_Report")
+        for index in range(2):
+            merged.merge_results(str(tmp_path / f"gw{index}" / "results.json"))
+        with open(merged.generate_report(), 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        assert merged.counts['total'] == 2
+        assert html.count("test_worker_0") == 1
+        assert html.count("test_worker_1") == 1
+        assert not list(tmp_path.glob("**/*.partial.html"))
+
+    def test_lazy_worker_reports_keep_separate_data_dirs(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        data_dirs = []
+        for index in range(2):
+            worker_dir = tmp_path / f"gw{index}"
+            worker_dir.mkdir()
+            report = finished_report(str(worker_dir), [f"test_worker_{index}"], mode="lazy")
+            report.save_results(str(worker_dir / "results.json"))
+            data_dirs.append(report.lazy_writer.data_dir)
+
+        assert data_dirs[0] != data_dirs[1]
+        for index, data_dir in enumerate(data_dirs):
+            with open(os.path.join(data_dir, "rows_00000.js"), 'r', encoding='utf-8') as f:
+                assert f"test_worker_{index}" in f.read()
+
+
+class TestResultsStore:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = ResultsStore(str(tmp_path / "results.db"))
+        yield store
+        store.close()
+
+    @staticmethod
+    def record(store, run_id, outcomes, duration=1.0):
+        store.record_run(run_id, {nodeid: {'outcome': outcome, 'duration': duration, 'error': None}
+                                  for nodeid, outcome in outcomes.items()})
+
+    def test_last_failed_uses_latest_outcome(self, store):
+        self.record(store, "run1", {"a": "failed", "b": "failed", "c": "passed"})
+        self.record(store, "run2", {"a": "passed", "c": "skipped"})
+
+        assert store.last_failed() == ["b"]
+
+    def test_flakiness_scores_flipping_tests_only(self, store):
+        for index, outcome in enumerate(["passed", "failed", "passed", "failed"]):
+            self.record(store, f"run{index}", {"flaky": outcome, "stable": "passed", "broken": "failed"})
+
+        scores = store.flakiness()
+        assert set(scores) == {"flaky"}
+        assert scores["flaky"] == (1.0, 2, 4)
+
+    def test_duration_regressions_compare_against_median(self, store):
+        for index in range(3):
+            self.record(store, f"run{index}", {"slow": "passed", "steady": "passed"}, duration=1.0)
+        store.record_run("now", {"slow": {'outcome': 'passed', 'duration': 3.0, 'error': None},
+                                 "steady": {'outcome': 'passed', 'duration': 1.1, 'error': None}})
+
+        assert store.duration_regressions("now") == [("slow", 1.0, 3.0, 3.0)]
+
+
+class TestRerunPolicy:
+
+    @staticmethod
+    def item(attempt, call_outcome):
+        report = SimpleNamespace(failed=call_outcome == "failed")
+        return SimpleNamespace(attempt=attempt, rep_setup=None, rep_call=report)
+
+    def test_will_rerun_failed_test_until_attempts_used(self):
+        policy = RerunPolicy(reruns=2, backoff=1, max_backoff=30, max_requeues=3)
+
+        assert policy.will_rerun(self.item(1, "failed"))
+        assert policy.will_rerun(self.item(2, "failed"))
+        assert not policy.will_rerun(self.item(3, "failed"))
+        assert not policy.will_rerun(self.item(1, "passed"))
+
+    def test_xfail_is_not_rerun(self):
+        policy = RerunPolicy(reruns=1, backoff=1, max_backoff=30, max_requeues=3)
+        item = self.item(1, "failed")
+        item.rep_call.wasxfail = "expected"
+
+        assert not policy.will_rerun(item)
+
+    def test_delay_backs_off_exponentially_up_to_cap(self):
+        policy = RerunPolicy(reruns=5, backoff=1, max_backoff=5, max_requeues=3)
+
+        assert [policy.delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+
+
+class TestParseNodes:
+
+    def test_sessions_per_node(self):
+        nodes = parse_nodes("http://127.0.0.1:4444=2, http://127.0.0.1:4445/=4")
+
+        assert [(node.url, node.max_sessions) for node in nodes] == [
+            ("http://127.0.0.1:4444", 2), ("http://127.0.0.1:4445", 4)
+        ]
+
+    def test_default_sessions_and_empty_entries(self):
+        nodes = parse_nodes("http://grid:4444,,", default_sessions=3)
+
+        assert [(node.url, node.max_sessions) for node in nodes] == [("http://grid:4444", 3)]
+        assert parse_nodes("") == []
+
+
+class TestBrowserPool:
+
+    def test_reuses_warm_browser_until_max_uses(self):
+        pool = BrowserPool(FakeDriver, max_uses=2, max_size=1)
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        assert second is first and second.uses == 2
+        pool.release(second)
+        assert first.driver.quit_called
+        assert pool.acquire() is not first
+
+    def test_failed_test_recycles_browser(self):
+        pool = BrowserPool(FakeDriver, max_uses=10, max_size=1)
+        browser = pool.acquire()
+        pool.release(browser, recycle=True)
+
+        assert browser.driver.quit_called
+        assert pool.acquire() is not browser
+
+    def test_evict_idle_closes_idle_browser_and_frees_slot(self):
+        pool = BrowserPool(FakeDriver, max_uses=10, max_size=1)
+        assert not pool.evict_idle()
+        browser = pool.acquire()
+        pool.release(browser)
+
+        assert pool.evict_idle()
+        assert browser.driver.quit_called
+        assert pool.acquire() is not browser
+
+    def test_acquire_times_out_when_every_browser_is_in_use(self):
+        pool = BrowserPool(FakeDriver, max_uses=10, max_size=1, acquire_timeout=0.05)
+        pool.acquire()
+
+        with pytest.raises(RuntimeError, match="No pooled browser became free"):
+            pool.acquire()
+
+
+class TestDriverResolver:
+
+    @pytest.fixture
+    def resolver(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(DriverResolver, "_resolved", {})
+        monkeypatch.setattr(DriverResolver, "_browser_version", staticmethod(lambda: "120.0"))
+        return DriverResolver(cache_dir=str(tmp_path / "cache"), offline=True, local_driver=str(tmp_path / "missing"))
+
+    @staticmethod
+    def write_manifest(resolver, driver_path, browser_version="120.0", age=0):
+        os.makedirs(resolver.cache_dir, exist_ok=True)
+        with open(resolver.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'driver_path': driver_path, 'browser_version': browser_version,
+                       'resolved_at': time.time() - age}, f)
+
+    def test_fresh_manifest_is_reused_once_per_process(self, resolver, tmp_path):
+        driver = tmp_path / "chromedriver"
+        driver.write_text("")
+        self.write_manifest(resolver, str(driver))
+
+        resolved = resolver.resolve()
+        assert resolved['source'] == "manifest"
+        assert resolved['driver_path'] == str(driver)
+        assert not os.path.exists(resolver.lock_path)
+
+        os.remove(resolver.manifest_path)
+        assert resolver.resolve() is resolved
+
+    def test_stale_lock_file_is_taken_over(self, resolver, tmp_path):
+        driver = tmp_path / "chromedriver"
+        driver.write_text("")
+        self.write_manifest(resolver, str(driver))
+        with open(resolver.lock_path, 'w') as f:
+            f.write("12345")
+        old = time.time() - 3600
+        os.utime(resolver.lock_path, (old, old))
+
+        assert resolver.resolve()['source'] == "manifest"
+        assert not os.path.exists(resolver.lock_path)
+
+    def test_offline_falls_back_to_stale_manifest_then_local_binary(self, resolver, tmp_path):
+        driver = tmp_path / "chromedriver"
+        driver.write_text("")
+        self.write_manifest(resolver, str(driver), browser_version="119.0")
+        assert resolver._resolve()['source'] == "stale manifest"
+
+        os.remove(resolver.manifest_path)
+        resolver.local_driver = str(driver)
+        assert resolver._resolve() == {'driver_path': str(driver), 'browser_version': "120.0",
+                                       'source': "local binary"}
+
+    def test_offline_without_any_driver_raises(self, resolver):
+        with pytest.raises(RuntimeError, match="No ChromeDriver available"):
+            resolver.resolve()
+
+
+class TestScreenshotPipeline:
+
+    def test_identical_screenshots_are_written_once(self, tmp_path):
+        pipeline = ScreenshotPipeline(str(tmp_path), image_format="png")
+        driver = FakeDriver()
+        first = pipeline.capture(driver, "test_one")
+        second = pipeline.capture(driver, "test_two")
+        driver.get("https://example.test/other")
+        third = pipeline.capture(driver, "test_three")
+        pipeline.close()
+
+        assert first == second != third
+        assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(first), os.path.basename(third)])
+
+
+class TestFailureArtifacts:
+
+    def test_capture_buffer_is_bounded_and_read_only_from_the_page(self, tmp_path):
+        driver = FakeDriver()
+        commands = []
+        driver.execute_cdp_cmd = lambda cmd, params: commands.append((cmd, params)) or {'identifier': "7"}
+        buffer = BrowserLogBuffer(max_entries=2, max_chars=100).start(driver)
+
+        assert commands[0][0] == "Page.addScriptToEvaluateOnNewDocument"
+        assert '"maxEntries": 2' in commands[0][1]['source']
+
+        page_log = {'token': buffer.token, 'seen': {'console': 5, 'network': 1},
+                    'console': [{'level': "ERROR", 'message': "boom"}, {'level': "LOG", 'message': "done"}],
+                    'network': [{'url': "https://example.test/app.js", 'status': None}]}
+        driver.execute_script = lambda script, *args: page_log if "__failureLog" in script else "<html></html>"
+        artifacts = dict((os.path.basename(path), label)
+                         for label, path in buffer.write_artifacts(driver, str(tmp_path)))
+        buffer.stop(driver)
+
+        assert artifacts == {"dom.html.gz": "DOM snapshot", "console.jsonl": "Console log (last 2 of 5)",
+                             "network.jsonl": "Network log (1)"}
+        assert (tmp_path / "network.jsonl").read_text() == '{"url": "https://example.test/app.js"}\n'
+        assert commands[-1] == ("Page.removeScriptToEvaluateOnNewDocument", {"identifier": "7"})
+
+    def test_stale_page_buffer_is_ignored(self, tmp_path):
+        driver = FakeDriver()
+        driver.execute_script = lambda script, *args: {'token': "previous test", 'seen': {}} \
+            if "__failureLog" in script else "<html></html>"
+
+        labels = [label for label, path in BrowserLogBuffer().write_artifacts(driver, str(tmp_path))]
+
+        assert labels == ["DOM snapshot"]
+
+
+class TestSmartWait:
+
+    @staticmethod
+    def ready_after(polls):
+        calls = []
+
+        def condition(driver):
+            calls.append(driver)
+            if len(calls) == 1:
+                raise NoSuchElementException("not yet")
+            return "ready" if len(calls) >= polls else None
+        return condition
+
+    def test_polling_backs_off_up_to_max_poll(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(smart_wait.time, "sleep", sleeps.append)
+        records = []
+        wait = SmartWait(FakeDriver(), timeout=60, initial_poll=0.01, max_poll=0.03, backoff=2, on_wait=records.append)
+
+        assert wait.until(self.ready_after(5), name="ready") == "ready"
+        assert sleeps == [0.01, 0.02, 0.03, 0.03]
+        assert [(record.name, record.polls, record.success) for record in records] == [("ready", 5, True)]
+
+    def test_timeout_is_recorded_and_raised(self):
+        wait = SmartWait(FakeDriver(), timeout=0.05, initial_poll=0.01)
+
+        with pytest.raises(TimeoutException, match="never"):
+            wait.until(lambda driver: False, name="never")
+        assert not wait.records[0].success
+
+    def test_any_of_returns_first_truthy_value(self):
+        missing = self.ready_after(99)
+
+        assert any_of(missing, lambda driver: None, lambda driver: "second", lambda driver: "third")(None) == "second"
+        assert any_of(missing, lambda driver: 0)(None) is False
+
+    def test_all_of_needs_every_condition(self):
+        assert all_of(lambda driver: 1, lambda driver: "a")(None) == [1, "a"]
+        assert all_of(lambda driver: 1, lambda driver: None)(None) is False
+
+
+class TestPerfBudget:
+
+    def test_reports_each_page_over_budget(self):
+        pages = [("https://example.test/", {'lcp_ms': 3000, 'cls': 0.05}),
+                 ("https://example.test/s", {'lcp_ms': 1800, 'cls': 0.3})]
+
+        assert PerfMetricsCollector.check_budget(pages, {'lcp_ms': 2500, 'cls': 0.1}) == [
+            "lcp_ms=3000 exceeds budget 2500 on https://example.test/",
+            "cls=0.3 exceeds budget 0.1 on https://example.test/s",
+        ]
+
+    def test_budget_metric_never_collected_is_a_violation(self):
+        pages = [("https://example.test/", {'cls': 0.0})]
+
+        assert PerfMetricsCollector.check_budget(pages, {'lcp_ms': 2500}) == ["lcp_ms was not collected on any page"]
+        assert PerfMetricsCollector.check_budget([], {'cls': 0.1}) == ["cls was not collected on any page"]
+
+    def test_unknown_budget_metrics(self):
+        assert PerfMetricsCollector.unknown_budget_metrics({'lcp': 2500, 'cls': 0.1, 'ttfb': 1}) == ["lcp", "ttfb"]
+
+
+class TestScenarioRunner:
+
+    def test_malformed_rows_become_failed_scenarios(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        scenario_file = tmp_path / "scenarios.jsonl"
+        scenario_file.write_text('{"id": "no-query"}\n'
+                                 '{"query": "laptop", "min_results": "many"}\n'
+                                 '{not json\n'
+                                 '["laptop"]\n', encoding='utf-8')
+        report = ExtentReport("Scenario_Report", stream_dir=str(tmp_path))
+
+        runner = SearchScenarioRunner(FakeDriver(), "https://example.test", report).run(
+            iter_scenarios(str(scenario_file))
+        )
+
+        assert (runner.total, runner.passed) == (4, 0)
+        assert [failure.split(":", 2)[:2] for failure in runner.failures] == [
+            ["no-query", " invalid scenario"], ["laptop", " invalid scenario"],
+            ["line 3", " invalid scenario"], ["#4", " invalid scenario"],
+        ]
+        assert runner.failures[0].endswith("missing query")
+        assert runner.failures[1].endswith("invalid min_results 'many'")
+        assert "invalid JSON" in runner.failures[2]
+        assert runner.failures[3].endswith("expected an object, got list")
+        assert report.counts['FAIL'] == 4
+
+    def test_csv_row_with_missing_cells_is_parsed(self, tmp_path):
+        scenario_file = tmp_path / "scenarios.csv"
+        scenario_file.write_text("id,query,expect_text,min_results\nshort, usb hub \n", encoding='utf-8')
+
+        scenario = next(iter_scenarios(str(scenario_file)))
+        assert SearchScenarioRunner.parse(scenario) == ("short", "usb hub", "usb hub", 1)
+
+
+class TestSiteReplay:
+
+    @pytest.fixture
+    def server(self, tmp_path):
+        server = SiteReplayServer("https://www.amazon.com", snapshot_dir=str(tmp_path)).start()
+        yield server
+        server.stop()
+
+    def test_volatile_parameters_do_not_change_the_snapshot_key(self, server):
+        key = server.snapshot_key("GET", "/s?k=laptop")
+
+        assert server.snapshot_key("GET", "/s/ref=nb_sb_noss?k=laptop&crid=2X1&qid=1697&sprefix=lap") == key
+        assert server.snapshot_key("GET", "/s?k=phone") != key
+
+    def test_every_origin_is_rewritten_to_the_local_server(self, server):
+        local = server.url.encode()
+        html = (b'<a href="https://www.amazon.com/gp/cart"></a>'
+                b'<img src="https://m.media-amazon.com/images/logo.png">'
+                b'<script src="//fls-na.amazon.com/1/batch"></script>'
+                b'<script>var cdn = "https:\\/\\/images-na.ssl-images-amazon.com\\/x.js";</script>'
+                b'<svg xmlns="http://www.w3.org/2000/svg"></svg>')
+
+        rewritten = server.rewrite_urls(html)
+        assert b'href="' + local + b'/gp/cart"' in rewritten
+        assert b'src="' + local + b'/__site/https/m.media-amazon.com/images/logo.png"' in rewritten
+        assert b'src="' + local + b'/__site/https/fls-na.amazon.com/1/batch"' in rewritten
+        assert local.replace(b"/", b"\\/") + b"\\/__site\\/https\\/images-na.ssl-images-amazon.com\\/x.js" in rewritten
+        assert b'xmlns="http://www.w3.org/2000/svg"' in rewritten
+
+    def test_replays_third_party_assets_from_snapshots(self, server):
+        key = server.snapshot_key("GET", "/images/site.css", origin="https://m.media-amazon.com")
+        server.save(key, {'status': 200, 'headers': {'Content-Type': "text/css"}}, b"body { color: red; }")
+
+        with urllib.request.urlopen(f"{server.url}/__site/https/m.media-amazon.com/images/site.css") as response:
+            assert response.read() == b"body { color: red; }"
+        assert (server.hits, server.misses) == (1, 0)
+        assert server.chrome_arguments() == [f"--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE {server.host}"]
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pytest
+
+logger = logging.getLogger("TestAutomation")
+
+THREADED_FIXTURES = {"setup_class", "setup_method", "request"}
+# logging keeps per-phase state that only its pytest_runtest_setup creates; threadexception and
+# unraisableexception swap the process-wide excepthooks, which overlapping threads restore out of order
+UNTHREADED_CALL_PLUGINS = ("logging-plugin", "threadexception", "unraisableexception")
+SERIAL_MARKERS = ("skip", "skipif", "xfail")
+
+
+class ThreadedRunner:
+
+    def __init__(self, session, threads, browser_test, rerun_policy):
+        self.session = session
+        self.threads = threads
+        self.browser_test = browser_test
+        self.rerun_policy = rerun_policy
+        self._report_lock = threading.Lock()
+        plugins = session.config.pluginmanager
+        self._runtest_call = plugins.subset_hook_caller(
+            "pytest_runtest_call",
+            [plugin for plugin in map(plugins.get_plugin, UNTHREADED_CALL_PLUGINS) if plugin]
+        )
+
+    def eligible(self, item):
+        if getattr(item, "instance", None) is None:
+            return False
+        if any(item.get_closest_marker(name) for name in SERIAL_MARKERS):
+            return False
+        params = set(item.callspec.params) if hasattr(item, "callspec") else set()
+        return "setup_method" in item.fixturenames and set(item.fixturenames) <= THREADED_FIXTURES | params
+
+    def run(self):
+        threaded = [item for item in self.session.items if self.eligible(item)]
+        serial = [item for item in self.session.items if not self.eligible(item)]
+        logger.info(f"Threaded mode: {len(threaded)} tests on {self.threads} browser threads, "
+                    f"{len(serial)} tests run serially")
+
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="browser") as executor:
+            pending = {executor.submit(self.run_item, item): item for item in threaded}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    attempt = future.result()
+                    if attempt:
+                        # the test's Selenium node died: any free thread (and node) picks it up again
+                        pending[executor.submit(self.run_item, item, attempt)] = item
+
+        for index, item in enumerate(serial):
+            if self._stopping():
+                break
+            nextitem = serial[index + 1] if index + 1 < len(serial) else None
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+
+    def run_item(self, item, first_attempt=1):
+        if self._stopping():
+            return None
+        ihook = item.ihook
+        for attempt in range(first_attempt, self.rerun_policy.attempts + 1):
+            self.rerun_policy.start_attempt(item, attempt)
+            with self._report_lock:
+                ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+            reports = self.run_attempt(item)
+            if self.rerun_policy.will_requeue(item) and not self._stopping():
+                self.rerun_policy.requeue(item)
+                self._log(item, self.rerun_policy.mark_rerun(reports))
+                return attempt
+            if not self.rerun_policy.will_rerun(item) or self._stopping():
+                break
+            self._log(item, self.rerun_policy.mark_rerun(reports))
+            time.sleep(self.rerun_policy.delay(attempt))
+
+        self._log(item, reports)
+        with self._report_lock:
+            ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return None
+
+    def run_attempt(self, item):
+        if hasattr(item, "callspec"):
+            item.funcargs.update(item.callspec.params)
+
+        stack = ExitStack()
+        setup = pytest.CallInfo.from_call(
+            lambda: stack.enter_context(self.browser_test(item)).bind(item.instance), "setup"
+        )
+        reports = [self._report(item, setup)]
+        if setup.excinfo is None:
+            reports.append(self._report(item, pytest.CallInfo.from_call(lambda: self._runtest_call(item=item), "call")))
+        reports.append(self._report(item, pytest.CallInfo.from_call(stack.close, "teardown")))
+        return reports
+
+    def _report(self, item, call):
+        return item.ihook.pytest_runtest_makereport(item=item, call=call)
+
+    def _log(self, item, reports):
+        with self._report_lock:
+            for report in reports:
+                item.ihook.pytest_runtest_logreport(report=report)
+
+    def _stopping(self):
+        return bool(self.session.shouldstop or self.session.shouldfail)